@@ -0,0 +1,91 @@
+"""
+Memory and wall-clock cost of running checkout flows in browser contexts of one
+Chrome versus one Chrome per flow.
+
+    python -m benchmarks.contexts --local-app --flows 8 --concurrency 4
+"""
+import argparse
+import time
+
+from mock_app.server import MockServer
+from pages.checkout_page import CheckoutPage
+from pages.login_page import LoginPage
+from pages.products_page import DEFAULT_CART
+from utils.config import app_url, set_base_url
+from utils.contexts import ContextScheduler, browser_memory
+from utils.driver_factory import create_driver, quit_driver
+
+
+def checkout_flow(driver):
+    driver.get(app_url())
+    LoginPage(driver).login("standard_user", "secret_sauce")
+    CheckoutPage(driver).seed_cart(DEFAULT_CART)
+    checkout = CheckoutPage(driver)
+    checkout.open("checkout-step-one.html")
+    checkout.fill_checkout_info("Test", "User", "12345")
+    checkout.click_finish()
+    return checkout.get_success_message()
+
+
+def separate_browsers(flows):
+    started = time.monotonic()
+    memory = []
+    for _ in range(flows):
+        driver = create_driver()
+        try:
+            checkout_flow(driver)
+            memory.append(browser_memory(driver))
+        finally:
+            quit_driver(driver)
+    return time.monotonic() - started, memory
+
+
+def shared_browser(flows, concurrency):
+    driver = create_driver()
+    try:
+        driver.get(app_url())
+        scheduler = ContextScheduler(driver, concurrency)
+        results = scheduler.run([checkout_flow] * flows)
+        failures = [error for _, error in results if error]
+        if failures:
+            raise failures[0]
+        return scheduler.stats
+    finally:
+        quit_driver(driver)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--flows", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--app-url")
+    parser.add_argument("--local-app", action="store_true")
+    args = parser.parse_args()
+
+    server = None
+    if args.local_app:
+        server = MockServer().start()
+        set_base_url(server.url)
+    elif args.app_url:
+        set_base_url(args.app_url)
+
+    try:
+        seconds, memory = separate_browsers(args.flows)
+        known = [m for m in memory if m]
+        print(f"one browser per flow : {seconds:7.2f}s", end="")
+        print(f"   {max(known) / 2**20:7.1f} MiB per browser" if known else "")
+
+        stats = shared_browser(args.flows, args.concurrency)
+        print(f"contexts x{args.concurrency:<2}         : {stats['seconds']:7.2f}s", end="")
+        if "bytes_per_context" in stats:
+            print(f"   {stats['bytes_per_context'] / 2**20:7.1f} MiB per context, "
+                  f"{stats['bytes_saved_per_test'] / 2**20:.1f} MiB saved per test")
+        else:
+            print("   (memory not measurable on this platform)")
+    finally:
+        if server:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
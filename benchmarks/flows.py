@@ -0,0 +1,204 @@
+"""
+Latency and WebDriver command count of the framework's hot paths, with regression gating.
+
+    python -m benchmarks.flows                       # against the bundled mock (default)
+    python -m benchmarks.flows --runs 30 --only login purchase_flow
+    python -m benchmarks.flows --update-baseline     # accept the current numbers
+
+Every operation runs ``--runs`` times on a pooled browser that is reset in
+between, exactly like a test lease. p50/p95/p99 and commands per run are
+compared with benchmarks/baselines/<name>.json; an operation whose p50 grew
+by more than ``--threshold`` or that now sends more commands fails the run
+(exit code 1). The first run on a machine records the baseline.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+from mock_app.server import MockServer
+from pages.base_page import url_contains
+from pages.cart_page import CartPage
+from pages.checkout_page import CheckoutPage
+from pages.login_page import LoginPage
+from pages.products_page import ProductsPage
+from utils.browser_pool import BrowserPool
+from utils.config import app_url, set_base_url
+from utils.driver_factory import create_driver, quit_driver
+from utils.instrumentation import CommandRecorder
+
+BASELINES_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+
+def login(driver):
+    LoginPage(driver).login("standard_user", "secret_sauce")
+    LoginPage(driver).wait_until(url_contains("inventory"), profile="navigation")
+
+
+def add_to_cart(driver):
+    products = ProductsPage(driver)
+    products.add_items_to_cart(2)
+    assert products.get_cart_count() == "2"
+
+
+def cart_navigation(driver):
+    ProductsPage(driver).go_to_cart()
+
+
+def purchase_flow(driver):
+    # Same steps as tests/test_positive_purchase.py::test_positive_purchase_flow
+    LoginPage(driver).login("standard_user", "secret_sauce")
+
+    products = ProductsPage(driver)
+    products.sort_low_to_high()
+    products.add_items_to_cart(2)
+    assert products.get_cart_count() == "2"
+
+    products.go_to_cart()
+    CartPage(driver).click_checkout()
+
+    checkout = CheckoutPage(driver)
+    checkout.fill_checkout_info("John", "Doe", "12345")
+    checkout.click_finish()
+    assert checkout.get_success_message() == "Thank you for your order!"
+
+
+def logged_in(driver):
+    LoginPage(driver).login_fast("standard_user")
+
+
+# name -> (untimed setup on a freshly reset browser, timed operation)
+OPERATIONS = {
+    "login": (None, login),
+    "add_to_cart": (logged_in, add_to_cart),
+    "cart_navigation": (logged_in, cart_navigation),
+    "purchase_flow": (None, purchase_flow),
+}
+
+
+def percentiles(samples):
+    if len(samples) == 1:
+        return {"p50": samples[0], "p95": samples[0], "p99": samples[0]}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98]}
+
+
+def result(samples, commands):
+    entry = {name: round(value * 1000, 2) for name, value in percentiles(samples).items()}
+    entry["runs"] = len(samples)
+    entry["commands"] = max(commands) if commands else None
+    return entry
+
+
+def measure_startup(runs):
+    """New Chrome session until the login page is loaded"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        driver = create_driver()
+        try:
+            driver.get(app_url())
+            samples.append(time.perf_counter() - start)
+        finally:
+            quit_driver(driver)
+    return result(samples, [])
+
+
+def measure(pool, driver, operation, runs):
+    setup, run = operation
+    recorder = CommandRecorder("benchmark")
+    recorder.attach(driver)
+    samples, commands = [], []
+    try:
+        for _ in range(runs):
+            pool.reset(driver)
+            if setup:
+                setup(driver)
+            before = len(recorder.commands)
+            start = time.perf_counter()
+            run(driver)
+            samples.append(time.perf_counter() - start)
+            commands.append(len(recorder.commands) - before)
+    finally:
+        recorder.detach(driver)
+    return result(samples, commands)
+
+
+def compare(results, baseline, threshold):
+    """Names of operations that regressed against ``baseline``"""
+    regressed = []
+    for name, entry in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        slower = entry["p50"] > previous["p50"] * (1 + threshold)
+        chattier = entry["commands"] is not None and previous.get("commands") is not None \
+            and entry["commands"] > previous["commands"]
+        if slower or chattier:
+            regressed.append(name)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--only", nargs="+", choices=["startup", *OPERATIONS], help="Operations to run")
+    parser.add_argument("--app-url", help="Benchmark another deployment instead of the bundled mock")
+    parser.add_argument("--baseline", default="local", help="Baseline name in benchmarks/baselines/")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed p50 slowdown (0.2 = 20%%)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    server = None
+    if args.app_url:
+        set_base_url(args.app_url)
+    else:
+        server = MockServer().start()
+        set_base_url(server.url)
+
+    names = args.only or ["startup", *OPERATIONS]
+    results = {}
+    pool = BrowserPool()
+    try:
+        if "startup" in names:
+            results["startup"] = measure_startup(max(1, args.runs // 4))
+        driver = pool.acquire()
+        for name in names:
+            if name != "startup":
+                results[name] = measure(pool, driver, OPERATIONS[name], args.runs)
+        pool.release(driver)
+    finally:
+        pool.close()
+        if server:
+            server.stop()
+
+    path = os.path.join(BASELINES_DIR, args.baseline + ".json")
+    baseline = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            baseline = json.load(f)
+
+    print(f"{'operation':<16} {'p50':>9} {'p95':>9} {'p99':>9} {'commands':>9} {'baseline p50':>13}")
+    for name, entry in results.items():
+        previous = baseline.get(name, {}).get("p50")
+        print(
+            f"{name:<16} {entry['p50']:7.1f}ms {entry['p95']:7.1f}ms {entry['p99']:7.1f}ms "
+            f"{entry['commands'] if entry['commands'] is not None else '-':>9} "
+            f"{f'{previous:.1f}ms' if previous is not None else '-':>13}"
+        )
+
+    regressed = compare(results, baseline, args.threshold)
+    if args.update_baseline or not baseline:
+        os.makedirs(BASELINES_DIR, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({**baseline, **results}, f, indent=2, sort_keys=True)
+        print(f"baseline written to {path}")
+    elif regressed:
+        print(f"regressed past {args.threshold:.0%} of baseline p50 or sent more commands: {', '.join(regressed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
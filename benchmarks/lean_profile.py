@@ -0,0 +1,84 @@
+"""
+Page-load time of the inventory page with and without the lean browser profile.
+
+    python -m benchmarks.lean_profile                # against $SAUCEDEMO_URL / saucedemo.com
+    python -m benchmarks.lean_profile --local-app    # against the bundled mock
+    python -m benchmarks.lean_profile --runs 20
+"""
+import argparse
+import statistics
+import time
+
+from mock_app.server import MockServer
+from pages.login_page import LoginPage
+from utils import lean_profile
+from utils.config import app_url, set_base_url
+from utils.driver_factory import create_driver, quit_driver
+
+LOAD_TIME_SCRIPT = """
+const entry = performance.getEntriesByType("navigation")[0];
+return {
+    domContentLoaded: entry.domContentLoadedEventEnd,
+    load: entry.loadEventEnd,
+    resources: performance.getEntriesByType("resource").length,
+    bytes: performance.getEntriesByType("resource").reduce((sum, r) => sum + r.transferSize, 0),
+};
+"""
+
+
+def measure(lean, runs, page):
+    driver = create_driver(lean=lean)
+    try:
+        lean_profile.apply(driver, lean)
+        driver.get(app_url())
+        LoginPage(driver).login_fast("standard_user")
+
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            driver.get(app_url(page))
+            wall = (time.perf_counter() - start) * 1000
+            timing = driver.execute_script(LOAD_TIME_SCRIPT)
+            samples.append((wall, timing["load"], timing["resources"], timing["bytes"]))
+        return samples
+    finally:
+        quit_driver(driver)
+
+
+def summarize(label, samples):
+    wall = [s[0] for s in samples]
+    load = [s[1] for s in samples]
+    print(
+        f"{label:<6} wall p50 {statistics.median(wall):8.1f} ms   "
+        f"loadEventEnd p50 {statistics.median(load):8.1f} ms   "
+        f"resources {samples[-1][2]:3d}   transferred {samples[-1][3] / 1024:8.1f} KiB"
+    )
+    return statistics.median(wall)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--page", default="inventory.html")
+    parser.add_argument("--app-url")
+    parser.add_argument("--local-app", action="store_true")
+    args = parser.parse_args()
+
+    server = None
+    if args.local_app:
+        server = MockServer().start()
+        set_base_url(server.url)
+    elif args.app_url:
+        set_base_url(args.app_url)
+
+    try:
+        full = summarize("full", measure(False, args.runs, args.page))
+        lean = summarize("lean", measure(True, args.runs, args.page))
+        print(f"lean profile saves {full - lean:.1f} ms per load ({(1 - lean / full) * 100:.0f}%)")
+    finally:
+        if server:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Browser session startup with and without ahead-of-time provisioning.
+
+    python -m utils.provisioning           # once
+    python -m benchmarks.startup --runs 10
+
+Compares Selenium Manager resolving the driver on every start, the pinned
+chromedriver/Chrome pair, and the pinned pair starting from a clone of the
+warmed-up profile template. Each start is timed until the login page has loaded.
+"""
+import argparse
+import statistics
+import time
+
+from mock_app.server import MockServer
+from utils import provisioning
+from utils.config import app_url, set_base_url
+from utils.driver_factory import create_driver, quit_driver
+
+MODES = {
+    "selenium manager": dict(provisioned=False),
+    "pinned": dict(provisioned=True, profile=False),
+    "pinned + profile": dict(provisioned=True, profile=True),
+}
+
+
+def measure(runs, **kwargs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        driver = create_driver(**kwargs)
+        try:
+            driver.get(app_url())
+            samples.append((time.perf_counter() - start) * 1000)
+        finally:
+            quit_driver(driver)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--app-url", help="Load this instead of the bundled mock")
+    args = parser.parse_args()
+
+    if provisioning.load_manifest() is None:
+        parser.error("nothing provisioned yet, run: python -m utils.provisioning")
+
+    server = None
+    if args.app_url:
+        set_base_url(args.app_url)
+    else:
+        server = MockServer().start()
+        set_base_url(server.url)
+
+    try:
+        baseline = None
+        for label, kwargs in MODES.items():
+            samples = measure(args.runs, **kwargs)
+            p50 = statistics.median(samples)
+            baseline = baseline or p50
+            print(f"{label:<17} p50 {p50:8.1f} ms   max {max(samples):8.1f} ms   "
+                  f"{(1 - p50 / baseline) * 100:5.1f}% faster than selenium manager")
+    finally:
+        if server:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
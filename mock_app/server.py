@@ -0,0 +1,59 @@
+"""
+Local stand-in for https://www.saucedemo.com/.
+
+Serves static copies of the pages the page objects touch (login, inventory,
+cart, checkout steps, complete) with the same ids, classes, data-test
+attributes, cookie and localStorage keys. Run it by hand with
+``python -m mock_app.server [port]`` or let the ``--local-app`` pytest option
+start it for the session.
+"""
+import os
+import sys
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def end_headers(self):
+        # Every test run should see the current files, never a cached copy
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+
+class MockServer:
+    def __init__(self, host="127.0.0.1", port=0):
+        handler = partial(_QuietHandler, directory=STATIC_DIR)
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+
+if __name__ == "__main__":
+    server = MockServer(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8000)
+    print(f"Serving mock SauceDemo on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
@@ -0,0 +1,355 @@
+// Minimal stand-in for the SauceDemo single page app. It only reproduces the markup,
+// cookie ("session-username") and localStorage ("cart-contents") behaviour the page
+// objects in pages/ rely on.
+(function () {
+    "use strict";
+
+    var PASSWORD = "secret_sauce";
+    var USERS = ["standard_user", "locked_out_user", "problem_user",
+                 "performance_glitch_user", "error_user", "visual_user"];
+    var CART_KEY = "cart-contents";
+
+    var PRODUCTS = [
+        {id: 4, name: "Sauce Labs Backpack", price: 29.99},
+        {id: 0, name: "Sauce Labs Bike Light", price: 9.99},
+        {id: 1, name: "Sauce Labs Bolt T-Shirt", price: 15.99},
+        {id: 5, name: "Sauce Labs Fleece Jacket", price: 49.99},
+        {id: 2, name: "Sauce Labs Onesie", price: 7.99},
+        {id: 3, name: "Test.allTheThings() T-Shirt (Red)", price: 15.99}
+    ];
+
+    var root = document.getElementById("root");
+    var page = window.location.pathname.split("/").pop() || "index.html";
+
+    // ---- state helpers ----------------------------------------------------
+
+    function slug(name) {
+        return name.toLowerCase().replace(/ /g, "-");
+    }
+
+    function product(id) {
+        return PRODUCTS.filter(function (p) { return p.id === id; })[0];
+    }
+
+    function currentUser() {
+        var match = document.cookie.match(/(?:^|; )session-username=([^;]*)/);
+        return match ? decodeURIComponent(match[1]) : null;
+    }
+
+    function getCart() {
+        try {
+            return JSON.parse(window.localStorage.getItem(CART_KEY)) || [];
+        } catch (e) {
+            return [];
+        }
+    }
+
+    function setCart(ids) {
+        if (ids.length) {
+            window.localStorage.setItem(CART_KEY, JSON.stringify(ids));
+        } else {
+            window.localStorage.removeItem(CART_KEY);
+        }
+    }
+
+    function go(target) {
+        window.location.href = target;
+    }
+
+    function el(tag, attrs, children) {
+        var node = document.createElement(tag);
+        Object.keys(attrs || {}).forEach(function (key) {
+            if (key === "text") {
+                node.textContent = attrs[key];
+            } else if (key === "onclick") {
+                node.addEventListener("click", attrs[key]);
+            } else {
+                node.setAttribute(key, attrs[key]);
+            }
+        });
+        (children || []).forEach(function (child) {
+            if (child) {
+                node.appendChild(child);
+            }
+        });
+        return node;
+    }
+
+    function money(value) {
+        return "$" + value.toFixed(2);
+    }
+
+    function errorBox(message) {
+        var box = el("div", {"class": "error-message-container" + (message ? " error" : "")});
+        if (message) {
+            var h3 = el("h3", {"data-test": "error", text: message});
+            h3.appendChild(el("button", {"class": "error-button", "data-test": "error-button", text: "x",
+                                         onclick: function () { box.className = "error-message-container"; box.innerHTML = ""; }}));
+            box.appendChild(h3);
+        }
+        return box;
+    }
+
+    // ---- shared chrome ----------------------------------------------------
+
+    function header(title) {
+        var menu = el("div", {"class": "bm-menu-wrap", "aria-hidden": "true"}, [
+            el("nav", {"class": "bm-item-list"}, [
+                el("a", {id: "inventory_sidebar_link", "class": "bm-item menu-item", href: "inventory.html", text: "All Items"}),
+                el("a", {id: "about_sidebar_link", "class": "bm-item menu-item", href: "https://saucelabs.com/", text: "About"}),
+                el("a", {id: "logout_sidebar_link", "class": "bm-item menu-item", href: "#", text: "Logout",
+                         onclick: function (event) {
+                             event.preventDefault();
+                             document.cookie = "session-username=; path=/; max-age=0";
+                             go("index.html");
+                         }}),
+                el("a", {id: "reset_sidebar_link", "class": "bm-item menu-item", href: "#", text: "Reset App State",
+                         onclick: function (event) {
+                             event.preventDefault();
+                             setCart([]);
+                             render();
+                         }})
+            ]),
+            el("button", {id: "react-burger-cross-btn", text: "Close menu",
+                          onclick: function () { menu.className = "bm-menu-wrap"; menu.setAttribute("aria-hidden", "true"); }})
+        ]);
+
+        var count = getCart().length;
+        var cartLink = el("a", {"class": "shopping_cart_link", "data-test": "shopping-cart-link", href: "cart.html"}, [
+            count ? el("span", {"class": "shopping_cart_badge", "data-test": "shopping-cart-badge", text: String(count)}) : null
+        ]);
+
+        return el("div", {id: "header_container", "class": "header_container"}, [
+            el("div", {"class": "primary_header"}, [
+                el("div", {id: "menu_button_container"}, [
+                    el("button", {id: "react-burger-menu-btn", text: "Open Menu",
+                                  onclick: function () { menu.className = "bm-menu-wrap open"; menu.setAttribute("aria-hidden", "false"); }}),
+                    menu
+                ]),
+                el("div", {"class": "app_logo", text: "Swag Labs"}),
+                el("div", {id: "shopping_cart_container", "class": "shopping_cart_container"}, [cartLink])
+            ]),
+            el("div", {"class": "header_secondary_container"}, [
+                el("span", {"class": "title", "data-test": "title", text: title})
+            ])
+        ]);
+    }
+
+    function cartItem(item, removable) {
+        return el("div", {"class": "cart_item", "data-test": "inventory-item"}, [
+            el("div", {"class": "cart_quantity", "data-test": "item-quantity", text: "1"}),
+            el("div", {"class": "cart_item_label"}, [
+                el("a", {id: "item_" + item.id + "_title_link", href: "#"}, [
+                    el("div", {"class": "inventory_item_name", "data-test": "inventory-item-name", text: item.name})
+                ]),
+                el("div", {"class": "item_pricebar"}, [
+                    el("div", {"class": "inventory_item_price", "data-test": "inventory-item-price", text: money(item.price)}),
+                    removable ? el("button", {id: "remove-" + slug(item.name), "data-test": "remove-" + slug(item.name),
+                                              "class": "btn btn_secondary btn_small cart_button", text: "Remove",
+                                              onclick: function () {
+                                                  setCart(getCart().filter(function (id) { return id !== item.id; }));
+                                                  render();
+                                              }}) : null
+                ])
+            ])
+        ]);
+    }
+
+    // ---- pages ------------------------------------------------------------
+
+    function loginPage(message) {
+        var user = el("input", {id: "user-name", name: "user-name", "class": "input_error form_input",
+                                placeholder: "Username", type: "text", "data-test": "username"});
+        var password = el("input", {id: "password", name: "password", "class": "input_error form_input",
+                                    placeholder: "Password", type: "password", "data-test": "password"});
+        var errors = errorBox(message);
+
+        var form = el("form", {}, [
+            user, password, errors,
+            el("input", {type: "submit", id: "login-button", name: "login-button", "class": "submit-button btn_action",
+                         "data-test": "login-button", value: "Login"})
+        ]);
+        form.addEventListener("submit", function (event) {
+            event.preventDefault();
+            var problem = null;
+            if (!user.value) {
+                problem = "Epic sadface: Username is required";
+            } else if (!password.value) {
+                problem = "Epic sadface: Password is required";
+            } else if (USERS.indexOf(user.value) === -1 || password.value !== PASSWORD) {
+                problem = "Epic sadface: Username and password do not match any user in this service";
+            } else if (user.value === "locked_out_user") {
+                problem = "Epic sadface: Sorry, this user has been locked out.";
+            }
+
+            if (problem) {
+                form.replaceChild(errorBox(problem), form.querySelector(".error-message-container"));
+                return;
+            }
+            document.cookie = "session-username=" + encodeURIComponent(user.value) + "; path=/; max-age=600";
+            go("inventory.html");
+        });
+
+        return el("div", {"class": "login_wrapper"}, [el("div", {"class": "login_logo", text: "Swag Labs"}), form]);
+    }
+
+    function inventoryPage() {
+        var order = root.getAttribute("data-sort") || "az";
+        var sorted = PRODUCTS.slice().sort(function (a, b) {
+            if (order === "za") { return b.name.localeCompare(a.name); }
+            if (order === "lohi") { return a.price - b.price; }
+            if (order === "hilo") { return b.price - a.price; }
+            return a.name.localeCompare(b.name);
+        });
+        var cart = getCart();
+
+        var select = el("select", {"class": "product_sort_container", "data-test": "product-sort-container"},
+            [["az", "Name (A to Z)"], ["za", "Name (Z to A)"], ["lohi", "Price (low to high)"], ["hilo", "Price (high to low)"]]
+                .map(function (option) { return el("option", {value: option[0], text: option[1]}); }));
+        select.value = order;
+        select.addEventListener("change", function () {
+            root.setAttribute("data-sort", select.value);
+            render();
+        });
+
+        var items = sorted.map(function (item) {
+            var inCart = cart.indexOf(item.id) !== -1;
+            var action = (inCart ? "remove-" : "add-to-cart-") + slug(item.name);
+            return el("div", {"class": "inventory_item", "data-test": "inventory-item"}, [
+                el("div", {"class": "inventory_item_img"}, [
+                    el("img", {"class": "inventory_item_img", alt: item.name, src: "img/product.svg"})
+                ]),
+                el("div", {"class": "inventory_item_description"}, [
+                    el("a", {id: "item_" + item.id + "_title_link", href: "#"}, [
+                        el("div", {"class": "inventory_item_name", "data-test": "inventory-item-name", text: item.name})
+                    ]),
+                    el("div", {"class": "pricebar"}, [
+                        el("div", {"class": "inventory_item_price", "data-test": "inventory-item-price", text: money(item.price)}),
+                        el("button", {id: action, name: action, "data-test": action,
+                                      "class": "btn btn_small btn_inventory " + (inCart ? "btn_secondary" : "btn_primary"),
+                                      text: inCart ? "Remove" : "Add to cart",
+                                      onclick: function () {
+                                          var ids = getCart();
+                                          setCart(inCart ? ids.filter(function (id) { return id !== item.id; }) : ids.concat([item.id]));
+                                          render();
+                                      }})
+                    ])
+                ])
+            ]);
+        });
+
+        return el("div", {"class": "page_wrapper"}, [
+            header("Products"),
+            el("div", {"class": "header_secondary_container"}, [select]),
+            el("div", {"class": "inventory_list", "data-test": "inventory-list"}, items)
+        ]);
+    }
+
+    function cartPage() {
+        var items = getCart().map(product).filter(Boolean);
+        return el("div", {"class": "page_wrapper"}, [
+            header("Your Cart"),
+            el("div", {"class": "cart_list", "data-test": "cart-list"}, items.map(function (item) { return cartItem(item, true); })),
+            el("div", {"class": "cart_footer"}, [
+                el("button", {id: "continue-shopping", "data-test": "continue-shopping", "class": "btn btn_secondary back",
+                              text: "Continue Shopping", onclick: function () { go("inventory.html"); }}),
+                el("button", {id: "checkout", "data-test": "checkout", "class": "btn btn_action checkout_button",
+                              text: "Checkout", onclick: function () { go("checkout-step-one.html"); }})
+            ])
+        ]);
+    }
+
+    function stepOnePage() {
+        var first = el("input", {id: "first-name", name: "firstName", "class": "input_error form_input", placeholder: "First Name",
+                                 type: "text", "data-test": "firstName"});
+        var last = el("input", {id: "last-name", name: "lastName", "class": "input_error form_input", placeholder: "Last Name",
+                                type: "text", "data-test": "lastName"});
+        var postal = el("input", {id: "postal-code", name: "postalCode", "class": "input_error form_input",
+                                  placeholder: "Zip/Postal Code", type: "text", "data-test": "postalCode"});
+
+        var form = el("form", {}, [
+            first, last, postal, errorBox(null),
+            el("div", {"class": "checkout_buttons"}, [
+                el("button", {id: "cancel", "data-test": "cancel", "class": "btn btn_secondary back cart_cancel_link",
+                              type: "button", text: "Cancel", onclick: function () { go("cart.html"); }}),
+                el("input", {type: "submit", id: "continue", name: "continue", "data-test": "continue",
+                             "class": "submit-button btn btn_primary cart_button btn_action", value: "Continue"})
+            ])
+        ]);
+        form.addEventListener("submit", function (event) {
+            event.preventDefault();
+            var problem = !first.value ? "Error: First Name is required"
+                : !last.value ? "Error: Last Name is required"
+                : !postal.value ? "Error: Postal Code is required" : null;
+            if (problem) {
+                form.replaceChild(errorBox(problem), form.querySelector(".error-message-container"));
+                return;
+            }
+            go("checkout-step-two.html");
+        });
+
+        return el("div", {"class": "page_wrapper"}, [header("Checkout: Your Information"), el("div", {"class": "checkout_info"}, [form])]);
+    }
+
+    function stepTwoPage() {
+        var items = getCart().map(product).filter(Boolean);
+        var subtotal = items.reduce(function (sum, item) { return sum + item.price; }, 0);
+        var tax = Math.round(subtotal * 8) / 100;
+
+        return el("div", {"class": "page_wrapper"}, [
+            header("Checkout: Overview"),
+            el("div", {"class": "cart_list", "data-test": "cart-list"}, items.map(function (item) { return cartItem(item, false); })),
+            el("div", {"class": "summary_info"}, [
+                el("div", {"class": "summary_subtotal_label", "data-test": "subtotal-label", text: "Item total: " + money(subtotal)}),
+                el("div", {"class": "summary_tax_label", "data-test": "tax-label", text: "Tax: " + money(tax)}),
+                el("div", {"class": "summary_total_label", "data-test": "total-label", text: "Total: " + money(subtotal + tax)}),
+                el("div", {"class": "cart_footer"}, [
+                    el("button", {id: "cancel", "data-test": "cancel", "class": "btn btn_secondary back cart_cancel_link",
+                                  text: "Cancel", onclick: function () { go("inventory.html"); }}),
+                    el("button", {id: "finish", "data-test": "finish", "class": "btn btn_action cart_button",
+                                  text: "Finish", onclick: function () { setCart([]); go("checkout-complete.html"); }})
+                ])
+            ])
+        ]);
+    }
+
+    function completePage() {
+        return el("div", {"class": "page_wrapper"}, [
+            header("Checkout: Complete!"),
+            el("div", {id: "checkout_complete_container", "class": "checkout_complete_container"}, [
+                el("h2", {"class": "complete-header", "data-test": "complete-header", text: "Thank you for your order!"}),
+                el("div", {"class": "complete-text", "data-test": "complete-text",
+                           text: "Your order has been dispatched, and will arrive just as fast as the pony can get there!"}),
+                el("button", {id: "back-to-products", "data-test": "back-to-products", "class": "btn btn_primary btn_small",
+                              text: "Back Home", onclick: function () { go("inventory.html"); }})
+            ])
+        ]);
+    }
+
+    var PAGES = {
+        "inventory.html": inventoryPage,
+        "cart.html": cartPage,
+        "checkout-step-one.html": stepOnePage,
+        "checkout-step-two.html": stepTwoPage,
+        "checkout-complete.html": completePage
+    };
+
+    function render() {
+        var view;
+        if (page === "index.html") {
+            view = loginPage(null);
+        } else if (!currentUser()) {
+            // Same behaviour as the real site when a protected page is opened logged out
+            var requested = page;
+            page = "index.html";
+            window.history.replaceState(null, "", "./");
+            view = loginPage("Epic sadface: You can only access '/" + requested + "' when you are logged in.");
+        } else {
+            view = (PAGES[page] || inventoryPage)();
+        }
+        root.innerHTML = "";
+        root.appendChild(view);
+    }
+
+    render();
+}());
@@ -0,0 +1,181 @@
+import json
+import time
+from urllib.request import urlopen
+
+from selenium.common.exceptions import JavascriptException
+
+from utils.browser_state import inject_cookies, to_cdp_cookie
+from utils.cdp import CdpConnection, CdpError
+
+# DevTools binding the page calls whenever it changes (see CHANGE_WATCH_SCRIPT)
+CHANGE_BINDING = "__pageChanged"
+
+# Calls the binding after DOM mutations and finished CSS transitions/animations,
+# at most once per task, so CdpBackend.pause can wake up instead of sleeping
+CHANGE_WATCH_SCRIPT = """
+(function () {
+    if (window.__changeWatch || typeof window.%(binding)s !== "function") {
+        return;
+    }
+    let queued = false;
+    const notify = function () {
+        if (queued) {
+            return;
+        }
+        queued = true;
+        setTimeout(function () {
+            queued = false;
+            window.%(binding)s("");
+        }, 0);
+    };
+    window.__changeWatch = new MutationObserver(notify);
+    const observe = function () {
+        window.__changeWatch.observe(document.documentElement,
+            {childList: true, subtree: true, attributes: true, characterData: true});
+    };
+    if (document.documentElement) {
+        observe();
+    } else {
+        document.addEventListener("DOMContentLoaded", observe);
+    }
+    document.addEventListener("transitionend", notify, true);
+    document.addEventListener("animationend", notify, true);
+})();
+""" % {"binding": CHANGE_BINDING}
+
+# Events after which a pending wait condition is worth checking again
+CHANGE_EVENTS = (
+    "Runtime.bindingCalled",
+    "Page.frameNavigated",
+    "Page.navigatedWithinDocument",
+    "Page.loadEventFired",
+    "Network.loadingFinished",
+)
+
+
+class WebDriverBackend:
+    """Classic WebDriver: one HTTP request to chromedriver per call"""
+
+    name = "webdriver"
+
+    # BasePage.wait_until polls on a backing-off timer
+    wakes_on_change = False
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def execute_script(self, script, *args):
+        return self.driver.execute_script(script, *args)
+
+    def pause(self, seconds):
+        """Block between two checks of a wait condition"""
+        time.sleep(seconds)
+
+    def navigate(self, url, timeout=10):
+        self.driver.get(url)
+
+    def current_url(self):
+        return self.driver.current_url
+
+    def set_cookies(self, cookies, url):
+        inject_cookies(self.driver, cookies, url)
+
+    def close(self):
+        pass
+
+
+class CdpBackend:
+    """
+    Chrome DevTools Protocol over one persistent websocket, next to the WebDriver session.
+
+    Scripts, navigation and cookie writes go over the socket; element
+    interaction (click, send_keys, ...) still goes through WebDriver, so the
+    page objects work unchanged. Commands can be pipelined, navigation
+    waits for the ``Page.loadEventFired`` event, and between two checks of a
+    wait condition ``pause`` returns as soon as the page reports a change
+    (DOM mutation, finished transition, navigation, completed request)
+    instead of sleeping. The backend drives the tab that was current when
+    it was created.
+    """
+
+    name = "cdp"
+
+    # BasePage.wait_until re-checks on change events; its timer is only a safety net
+    wakes_on_change = True
+
+    def __init__(self, driver):
+        self.driver = driver
+        address = driver.capabilities.get("goog:chromeOptions", {}).get("debuggerAddress")
+        if not address:
+            raise CdpError("The browser does not expose a DevTools debugger address")
+
+        with urlopen(f"http://{address}/json/version") as response:
+            browser_ws = json.load(response)["webSocketDebuggerUrl"]
+        self.connection = CdpConnection(browser_ws)
+
+        # chromedriver window handles are DevTools target ids
+        attached = self.connection.call(
+            "Target.attachToTarget", {"targetId": driver.current_window_handle, "flatten": True}
+        )
+        self.session_id = attached["sessionId"]
+        self.connection.send_many([
+            ("Page.enable", {}),
+            ("Network.enable", {}),
+            ("Runtime.enable", {}),
+            ("Runtime.addBinding", {"name": CHANGE_BINDING}),
+            ("Page.addScriptToEvaluateOnNewDocument", {"source": CHANGE_WATCH_SCRIPT}),
+            ("Runtime.evaluate", {"expression": CHANGE_WATCH_SCRIPT}),
+        ], self.session_id)
+
+    def _evaluate_params(self, script, args):
+        return {
+            "expression": "(function () {\n%s\n}).apply(null, %s)" % (script, json.dumps(list(args))),
+            "returnByValue": True,
+            "awaitPromise": True,
+        }
+
+    def _value(self, result):
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            message = details.get("exception", {}).get("description") or details.get("text", "")
+            raise JavascriptException(message)
+        return result["result"].get("value")
+
+    def execute_script(self, script, *args):
+        try:
+            params = self._evaluate_params(script, args)
+        except TypeError:
+            # Arguments such as WebElements only make sense to WebDriver
+            return self.driver.execute_script(script, *args)
+        return self._value(self.connection.call("Runtime.evaluate", params, self.session_id))
+
+    def pause(self, seconds):
+        """Block until the page changes or ``seconds`` pass, whichever comes first"""
+        self.connection.wait_for_any(CHANGE_EVENTS, self.session_id, seconds)
+
+    def navigate(self, url, timeout=10):
+        self.connection.clear_events("Page.loadEventFired")
+        result = self.connection.call("Page.navigate", {"url": url}, self.session_id)
+        if result.get("errorText"):
+            raise CdpError(f"Navigation to {url} failed: {result['errorText']}")
+        self.connection.wait_for_event("Page.loadEventFired", self.session_id, timeout)
+
+    def current_url(self):
+        return self.execute_script("return window.location.href;")
+
+    def set_cookies(self, cookies, url):
+        commands = [("Network.setCookie", to_cdp_cookie(cookie, url)) for cookie in cookies]
+        self.connection.send_many(commands, self.session_id)
+
+    def close(self):
+        try:
+            self.connection.call("Target.detachFromTarget", {"sessionId": self.session_id})
+        except CdpError:
+            pass
+        self.connection.close()
+
+
+BACKENDS = {
+    WebDriverBackend.name: WebDriverBackend,
+    CdpBackend.name: CdpBackend,
+}
@@ -1,22 +1,442 @@
+import logging
+import time
+from collections import namedtuple
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from pages import wait_policy
+from pages.backends import WebDriverBackend
+from pages.wait_policy import WaitPolicy
+from utils import instrumentation
+from utils.config import app_url
+
+logger = logging.getLogger(__name__)
+
+# localStorage key SauceDemo keeps the cart item ids under
+CART_STORAGE_KEY = "cart-contents"
+
+# Collects count, text, visibility and attributes for every query in one round-trip
+SNAPSHOT_SCRIPT = """
+const queries = arguments[0];
+const attributes = arguments[1];
+const result = {};
+for (const [name, kind, query] of queries) {
+    let elements = [];
+    if (kind === "xpath") {
+        const found = document.evaluate(query, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (let i = 0; i < found.snapshotLength; i++) {
+            elements.push(found.snapshotItem(i));
+        }
+    } else {
+        elements = Array.from(document.querySelectorAll(query));
+    }
+    result[name] = {
+        count: elements.length,
+        texts: elements.map(e => (e.innerText || "").trim()),
+        visible: elements.map(e => {
+            const style = window.getComputedStyle(e);
+            return e.getClientRects().length > 0 && style.visibility !== "hidden" && style.display !== "none";
+        }),
+        attributes: elements.map(e => {
+            const values = {};
+            for (const attribute of attributes) {
+                values[attribute] = e.getAttribute(attribute);
+            }
+            return values;
+        }),
+    };
+}
+return result;
+"""
+
+
+# Sets many inputs at once the way a user's typing would: through the native value
+# setter (React tracks the last value it saw and ignores a plain assignment) followed
+# by bubbling input and change events. Returns the queries that matched nothing.
+FILL_FORM_SCRIPT = """
+const fields = arguments[0];
+const missing = [];
+for (const [kind, query, value] of fields) {
+    const element = kind === "xpath"
+        ? document.evaluate(query, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+        : document.querySelector(query);
+    if (!element) {
+        missing.push(query);
+        continue;
+    }
+    const prototype = element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+        : element instanceof HTMLSelectElement ? HTMLSelectElement.prototype
+        : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(prototype, "value").set.call(element, value);
+    element.dispatchEvent(new Event("input", {bubbles: true}));
+    element.dispatchEvent(new Event("change", {bubbles: true}));
+}
+return missing;
+"""
+
+# How fill_form enters text: "script" (one call for the whole form) or "keys" (real keystrokes)
+INPUT_MODES = ("script", "keys")
+
+
+def _to_query(locator):
+    """Translate a Selenium locator tuple into a (kind, query) pair for SNAPSHOT_SCRIPT"""
+    by, value = locator
+    if by == By.XPATH:
+        return "xpath", value
+    if by == By.CSS_SELECTOR:
+        return "css", value
+    if by == By.ID:
+        return "css", '[id="%s"]' % value
+    if by == By.CLASS_NAME:
+        return "css", "." + value
+    if by == By.NAME:
+        return "css", '[name="%s"]' % value
+    if by == By.TAG_NAME:
+        return "css", value
+    raise ValueError(f"Locator strategy not supported by snapshot: {by}")
+
+
+WaitRecord = namedtuple("WaitRecord", "description seconds polls timed_out")
+
+
+class ElementCacheStats:
+    """Session-wide counters for the BasePage element cache"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    @property
+    def lookups(self):
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    @property
+    def round_trips_saved(self):
+        # Every hit skips a find_element; every stale handle costs one wasted command
+        return self.hits - self.stale
+
+
+element_cache = ElementCacheStats()
+
+
+# Wait conditions: callables taking the driver and returning something truthy once
+# they hold, so they work with BasePage.wait_until as well as with WebDriverWait.
+
+# Counts mutations in the document and how long ago the last one happened:
+# {count, quiet} with ``quiet`` in milliseconds
+DOM_OBSERVER_SCRIPT = """
+if (!window.__domWatch) {
+    window.__domWatch = {count: 0, last: performance.now()};
+    new MutationObserver(function (records) {
+        window.__domWatch.count += records.length;
+        window.__domWatch.last = performance.now();
+    }).observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return {count: window.__domWatch.count, quiet: performance.now() - window.__domWatch.last};
+"""
+
+# Resource timing entries are only added once a request completes, so "no new entry
+# for quiet_ms after the load event" is the closest in-page signal of an idle network
+NETWORK_IDLE_SCRIPT = """
+const quiet = arguments[0];
+const count = performance.getEntriesByType("resource").length;
+const state = window.__netWatch || (window.__netWatch = {count: -1, since: 0});
+if (state.count !== count) {
+    state.count = count;
+    state.since = performance.now();
+}
+return document.readyState === "complete" && performance.now() - state.since >= quiet;
+"""
+
+ANIMATIONS_SCRIPT = """
+const root = arguments[0] || document;
+const animations = root.getAnimations ? root.getAnimations({subtree: true}) : [];
+return animations.every(a => a.playState !== "running" && a.playState !== "pending");
+"""
+
+
+def url_changed(old_url):
+    """The browser has moved away from ``old_url``"""
+    def condition(driver):
+        return driver.current_url != old_url
+    condition.description = f"url changed from {old_url}"
+    return condition
+
+
+def url_contains(fragment):
+    def condition(driver):
+        return fragment in driver.current_url
+    condition.description = f"url contains {fragment!r}"
+    return condition
+
+
+def dom_mutated(since):
+    """
+    The DOM has changed since ``since`` (the count returned by BasePage.watch_dom).
+    Lets a wait react to React re-renders instead of guessing how long they take.
+    """
+    def condition(driver):
+        return driver.execute_script(DOM_OBSERVER_SCRIPT)["count"] > since
+    condition.description = "DOM mutated"
+    return condition
+
+
+def dom_settled(quiet_ms=150):
+    """No DOM mutation for ``quiet_ms``"""
+    def condition(driver):
+        return driver.execute_script(DOM_OBSERVER_SCRIPT)["quiet"] >= quiet_ms
+    condition.description = f"DOM quiet for {quiet_ms}ms"
+    return condition
+
+
+def animations_finished(locator=None):
+    """No CSS animation/transition is running in the document (or under ``locator``)"""
+    def condition(driver):
+        root = driver.find_element(*locator) if locator else None
+        return driver.execute_script(ANIMATIONS_SCRIPT, root)
+    condition.description = "animations finished"
+    return condition
+
+
+def network_idle(quiet_ms=300):
+    """Page loaded and no request has completed for ``quiet_ms``"""
+    def condition(driver):
+        return driver.execute_script(NETWORK_IDLE_SCRIPT, quiet_ms)
+    condition.description = f"network idle for {quiet_ms}ms"
+    return condition
+
+
+def element_present(locator):
+    def condition(driver):
+        elements = driver.find_elements(*locator)
+        return elements[0] if elements else False
+    condition.description = f"{locator[1]} present"
+    return condition
+
+
+def any_of(*conditions):
+    """First truthy result of several conditions"""
+    def condition(driver):
+        for each in conditions:
+            result = each(driver)
+            if result:
+                return result
+        return False
+    condition.description = " or ".join(getattr(c, "description", "condition") for c in conditions)
+    return condition
 
 
 class BasePage:
+    # Adaptive polling: start fast, back off while the condition keeps failing
+    POLL_START = 0.05
+    POLL_MAX = 0.5
+    POLL_BACKOFF = 1.5
+
+    # Per-page overrides of wait_policy.DEFAULT_TIMEOUTS
+    TIMEOUTS = {}
+
     def __init__(self, driver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 10)
+        # Scripts and navigation go through the backend the test selected (see pages/backends.py)
+        self.backend = getattr(driver, "page_backend", None) or WebDriverBackend(driver)
+        self.policy = WaitPolicy(self.TIMEOUTS)
+        self.wait = WebDriverWait(driver, self.policy.timeout("default"))
+        self.wait_log = []
+        # Element handles by locator; valid until navigation or a StaleElementReferenceException
+        self._elements = {}
+
+    def timeout(self, profile="default"):
+        return self.policy.timeout(profile)
+
+    def wait_until(self, condition, timeout=None, description=None, profile="default"):
+        """
+        Poll ``condition`` until it returns something truthy and return that value.
+        Between polls the backend pauses: WebDriver sleeps with backoff, CDP
+        returns as soon as the page changes.
+        ``timeout`` overrides the page's ``profile`` timeout for this call.
+        The time actually spent blocking is appended to ``self.wait_log`` (and logged).
+        Raises TimeoutException when the timeout runs out.
+        """
+        description = description or getattr(condition, "description", "condition")
+        if timeout is None:
+            timeout = self.policy.timeout(profile)
+        # A backend that wakes up when the page changes only needs the timer as a safety net
+        interval = self.POLL_MAX if self.backend.wakes_on_change else self.POLL_START
+        polls = 0
+        start = time.monotonic()
+        deadline = start + timeout
+
+        while True:
+            polls += 1
+            try:
+                result = condition(self.driver)
+            except WebDriverException:
+                # e.g. stale element or page navigating mid-script - just poll again
+                result = False
+
+            if result:
+                self._record_wait(description, time.monotonic() - start, polls, False)
+                return result
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._record_wait(description, time.monotonic() - start, polls, True)
+                wait_policy.record_timeout(type(self).__name__, description, timeout)
+                raise TimeoutException(f"Timed out after {timeout}s waiting for {description}")
+
+            self.backend.pause(min(interval, remaining))
+            interval = min(interval * self.POLL_BACKOFF, self.POLL_MAX)
+
+    def _record_wait(self, description, seconds, polls, timed_out):
+        record = WaitRecord(description, round(seconds, 3), polls, timed_out)
+        self.wait_log.append(record)
+        logger.debug("wait %s: %.3fs, %d polls%s", description, seconds, polls, " (timed out)" if timed_out else "")
+        instrumentation.record_wait(type(self).__name__, description, seconds, timed_out)
+
+    def is_present(self, locator):
+        """Fast-fail presence check: one find_elements call, no waiting"""
+        return len(self.driver.find_elements(*locator)) > 0
+
+    def watch_dom(self):
+        """Start (or read) the MutationObserver; pass the returned count to dom_mutated()"""
+        return self.backend.execute_script(DOM_OBSERVER_SCRIPT)["count"]
+
+    def find(self, locator):
+        """
+        Element for ``locator``, resolved once and then reused by this page object.
+        Raises NoSuchElementException when it isn't there (nothing is cached then).
+        """
+        element = self._elements.get(locator)
+        if element is not None:
+            element_cache.hits += 1
+            return element
+        element_cache.misses += 1
+        element = self._elements[locator] = self.driver.find_element(*locator)
+        return element
+
+    def forget(self, locator=None):
+        """Drop the cached handle for ``locator``, or every handle"""
+        if locator is None:
+            self._elements.clear()
+        else:
+            self._elements.pop(locator, None)
+
+    def _element_state(self, locator, clickable=False):
+        """Wait condition on the cached element: the element once visible (and enabled)"""
+        def condition(driver):
+            try:
+                element = self.find(locator)
+                if element.is_displayed() and (not clickable or element.is_enabled()):
+                    return element
+                return False
+            except StaleElementReferenceException:
+                # Re-rendered or navigated away: resolve the locator again on the next poll
+                element_cache.stale += 1
+                self.forget(locator)
+                return False
+        condition.description = f"{locator[1]} {'clickable' if clickable else 'visible'}"
+        return condition
+
+    def _act(self, locator, action, clickable=False):
+        """Wait for the element and run ``action`` on it, retrying once with a fresh handle if it went stale"""
+        try:
+            return action(self.wait_until(self._element_state(locator, clickable)))
+        except StaleElementReferenceException:
+            element_cache.stale += 1
+            self.forget(locator)
+            return action(self.wait_until(self._element_state(locator, clickable)))
 
     def wait_for_visible(self, locator):
-        return self.wait.until(EC.visibility_of_element_located(locator))
+        return self.wait_until(self._element_state(locator))
 
     def wait_for_clickable(self, locator):
-        return self.wait.until(EC.element_to_be_clickable(locator))
+        return self.wait_until(self._element_state(locator, clickable=True))
+
+    def page_changes(self):
+        """How often page objects have navigated this browser or changed its cart (see mark_page_changed)"""
+        return getattr(self.driver, "page_changes", 0)
+
+    def mark_page_changed(self):
+        """
+        Tell every page object on this browser that the page may have been replaced
+        or the cart changed, so reads they kept (ProductsPage.catalog) are taken again.
+        """
+        self.driver.page_changes = self.page_changes() + 1
+
+    def open(self, path=""):
+        """Navigate to an application page, e.g. self.open("cart.html")"""
+        self.forget()
+        self.mark_page_changed()
+        self.backend.navigate(app_url(path), timeout=self.policy.timeout("navigation"))
 
     def click(self, locator):
-        self.wait.until(EC.element_to_be_clickable(locator)).click()
+        self._act(locator, lambda element: element.click(), clickable=True)
 
     def type(self, locator, text):
-        element = self.wait_for_visible(locator)
-        element.clear()
-        element.send_keys(text)
\ No newline at end of file
+        def clear_and_type(element):
+            element.clear()
+            element.send_keys(text)
+        self._act(locator, clear_and_type)
+
+    def input_mode(self):
+        """The driver's input fidelity; the driver fixture sets "keys" for @pytest.mark.real_typing tests"""
+        return getattr(self.driver, "input_mode", "script")
+
+    def fill_form(self, fields, mode=None):
+        """
+        Set several inputs at once.
+        Args:
+            fields: dict of locator tuple -> text (None or "" leaves the field empty)
+            mode: "script" sets every field in one execute_script call and fires
+                input/change events; "keys" clears and types each field with real
+                keystrokes. Defaults to input_mode().
+        """
+        mode = mode or self.input_mode()
+        if mode not in INPUT_MODES:
+            raise ValueError(f"Unknown input mode {mode!r}, expected one of {INPUT_MODES}")
+
+        if mode == "keys":
+            for locator, value in fields.items():
+                if value:
+                    self.type(locator, value)
+                else:
+                    self.wait_for_visible(locator).clear()
+            return
+
+        entries = [[*_to_query(locator), value or ""] for locator, value in fields.items()]
+
+        def filled(driver):
+            # Re-running the script is harmless, so polling it also waits for the form to render
+            return not self.backend.execute_script(FILL_FORM_SCRIPT, entries)
+        filled.description = "form fields present"
+        self.wait_until(filled, profile="element")
+
+    def snapshot(self, selectors, attributes=()):
+        """
+        Read many locators in a single execute_script call.
+        Args:
+            selectors: dict of name -> locator tuple
+            attributes: attribute names to collect for every matched element
+        Returns:
+            dict of name -> {"count", "texts", "visible", "attributes"} (plain Python data)
+        """
+        queries = [[name, *_to_query(locator)] for name, locator in selectors.items()]
+        return self.backend.execute_script(SNAPSHOT_SCRIPT, queries, list(attributes))
+
+    def seed_cart(self, item_ids):
+        """
+        Write the cart state straight into localStorage with one script call.
+        The browser must be on a SauceDemo page; the app picks the cart up on the next page load.
+        """
+        self.backend.execute_script(
+            "window.localStorage.setItem(arguments[0], JSON.stringify(arguments[1]));",
+            CART_STORAGE_KEY,
+            list(item_ids),
+        )
+        self.mark_page_changed()
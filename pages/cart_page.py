@@ -1,13 +1,16 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import time
+from pages.base_page import BasePage, dom_mutated
+from pages.transitions import TransitionEngine
 
 
-class CartPage:
-    def __init__(self, driver):
-        self.driver = driver
-        self.wait = WebDriverWait(driver, 10)
+class CartPage(BasePage):
+    TIMEOUTS = {"removal": 3}
+
+    CART_ITEMS = (By.CLASS_NAME, "cart_item")
+    ITEM_NAMES = (By.CLASS_NAME, "inventory_item_name")
+    ITEM_PRICES = (By.CLASS_NAME, "inventory_item_price")
+    CART_BADGE = (By.CLASS_NAME, "shopping_cart_badge")
 
     def get_title(self):
         title = self.wait.until(
@@ -16,8 +19,19 @@ class CartPage:
         return title.text
 
     def get_cart_items_count(self):
-        items = self.driver.find_elements(By.CLASS_NAME, "cart_item")
-        return len(items)
+        return self.snapshot({"items": self.CART_ITEMS})["items"]["count"]
+
+    def has_cart_badge(self):
+        """The header badge is only rendered while the cart has items - checked without waiting"""
+        return self.is_present(self.CART_BADGE)
+
+    def get_cart_items(self):
+        """Names and prices of the listed items, read in one round-trip"""
+        data = self.snapshot({"names": self.ITEM_NAMES, "prices": self.ITEM_PRICES})
+        return [
+            (name, float(price.replace("$", "")))
+            for name, price in zip(data["names"]["texts"], data["prices"]["texts"])
+        ]
 
     def remove_first_item(self):
         # Get initial count
@@ -27,43 +41,31 @@ class CartPage:
         remove_btn = self.wait.until(
             EC.element_to_be_clickable((By.CSS_SELECTOR, ".cart_item button"))
         )
+        since = self.watch_dom()
         remove_btn.click()
 
-        # Wait for item to be removed from DOM
+        # Wait for React to re-render, then for the item to be gone from the DOM
+        self.wait_until(dom_mutated(since), profile="removal")
         self.wait.until(
             lambda d: len(d.find_elements(By.CLASS_NAME, "cart_item")) < initial_count
         )
 
     def remove_all_items(self):
-        while True:
-            buttons = self.driver.find_elements(By.CSS_SELECTOR, ".cart_item button")
-
-            if not buttons:
-                break
+        """Remove every item, one click each; a removal that never lands raises TimeoutException"""
+        initial_count = len(self.driver.find_elements(By.CSS_SELECTOR, ".cart_item button"))
 
-            buttons[0].click()
-            time.sleep(0.5)
-
-            try:
-                current_count = len(buttons)
-                WebDriverWait(self.driver, 3).until(
-                    lambda d: len(d.find_elements(By.CSS_SELECTOR, ".cart_item button")) < current_count
-                )
-            except:
-                pass
+        for current_count in range(initial_count, 0, -1):
+            self.driver.find_element(By.CSS_SELECTOR, ".cart_item button").click()
+            self.wait_until(
+                lambda d, count=current_count: len(d.find_elements(By.CSS_SELECTOR, ".cart_item button")) < count,
+                profile="removal",
+                description="cart item removed",
+            )
 
     def click_continue_shopping(self):
-        continue_btn = self.wait.until(
-            EC.element_to_be_clickable((By.ID, "continue-shopping"))
-        )
-        continue_btn.click()
-
-        # Wait for navigation to inventory page
-        self.wait.until(EC.url_contains("inventory"))
+        # Direct navigation unless the test forces the real button (see pages/transitions.py)
+        TransitionEngine(self).move("inventory")
 
     def click_checkout(self):
-        # Navigate directly to checkout page (more reliable than clicking)
-        self.driver.get("https://www.saucedemo.com/checkout-step-one.html")
-
-        # Wait for checkout page to load
-        self.wait.until(EC.url_contains("checkout"))
+        # Direct navigation unless the test forces the real button (see pages/transitions.py)
+        TransitionEngine(self).move("step_one")
@@ -1,5 +1,16 @@
+from urllib.parse import unquote
+
 from selenium.webdriver.common.by import By
-from pages.base_page import BasePage
+from pages.base_page import BasePage, url_contains
+from pages.transitions import TransitionEngine, current_state, state_for
+from utils.browser_state import capture_cookies, cookies_expired
+from utils.config import app_url, get_base_url
+
+# Session cookies captured by login_fast, keyed by (base URL, username)
+_sessions = {}
+
+# Cookie SauceDemo keeps the logged-in user in
+SESSION_COOKIE = "session-username"
 
 
 class LoginPage(BasePage):
@@ -7,12 +18,66 @@ class LoginPage(BasePage):
     PASSWORD = (By.ID, "password")
     LOGIN_BTN = (By.ID, "login-button")
     ERROR_MSG = (By.CSS_SELECTOR, "h3[data-test='error']")
+    ERROR_CLOSE_BTN = (By.CSS_SELECTOR, "[data-test='error-button']")
 
     def login(self, username, password):
-        self.type(self.USERNAME, username)
-        self.type(self.PASSWORD, password)
+        self.fill_form({self.USERNAME: username, self.PASSWORD: password})
         self.click(self.LOGIN_BTN)
 
+    def login_fast(self, username, password="secret_sauce", landing="inventory.html"):
+        """
+        Log in without the form when possible and open the ``landing`` page,
+        through the transition engine (so a test that forces the login edge
+        through the UI gets the real form, and the move is reported).
+        A browser already inside the flow as another user is logged out first.
+        """
+        if current_state(self.driver) not in (None, "login") and self.session_user() != username:
+            self.driver.delete_all_cookies()
+            self.open()
+        TransitionEngine(self).move(state_for(landing), username, password)
+
+    def session_user(self):
+        """User whose session cookie the browser holds, or None"""
+        cookie = self.driver.get_cookie(SESSION_COOKIE)
+        return unquote(cookie["value"]) if cookie else None
+
+    def inject_session(self, username, password="secret_sauce"):
+        """
+        Put ``username``'s session cookie into the browser without navigating and
+        return True. The first call for a user has no cookie yet: it logs in
+        through the form instead (landing on the inventory), captures the cookie
+        and returns False.
+        """
+        key = (get_base_url(), username)
+        cookies = _sessions.get(key)
+
+        if cookies is None or cookies_expired(cookies):
+            if current_state(self.driver) != "login":
+                self.open()
+            self.login(username, password)
+            self.wait_until(url_contains("inventory"), profile="navigation")
+            _sessions[key] = capture_cookies(self.driver)
+            return False
+
+        self.backend.set_cookies(cookies, app_url())
+        return True
+
+    def reset_form(self):
+        """
+        Empty login form with no error showing. On the login page that is two script
+        calls (dismiss the error, clear the fields); after a successful login the
+        session cookie is dropped and the login page opened again.
+        """
+        if self.driver.current_url.split("?")[0] != app_url():
+            self.driver.delete_all_cookies()
+            self.open()
+            return
+        self.backend.execute_script(
+            "const close = document.querySelector(arguments[0]); if (close) close.click();",
+            self.ERROR_CLOSE_BTN[1],
+        )
+        self.fill_form({self.USERNAME: "", self.PASSWORD: ""})
+
     def click_login(self):
         self.click(self.LOGIN_BTN)
 
@@ -20,4 +85,4 @@ class LoginPage(BasePage):
         return self.wait_for_visible(self.ERROR_MSG).is_displayed()
 
     def get_error_message(self):
-        return self.wait_for_visible(self.ERROR_MSG).text
\ No newline at end of file
+        return self.wait_for_visible(self.ERROR_MSG).text
@@ -0,0 +1,115 @@
+from collections import namedtuple
+
+from selenium.common.exceptions import StaleElementReferenceException
+
+# One inventory card; ``button`` is the live add/remove button element
+Product = namedtuple("Product", "id name price position in_cart button")
+
+# Every card's id, name, price, cart state and button in one round-trip
+CATALOG_SCRIPT = """
+return Array.from(document.querySelectorAll(".inventory_item")).map(item => {
+    const link = item.querySelector("a[id$='_title_link']");
+    const button = item.querySelector("button");
+    return {
+        id: link ? parseInt(link.id.split("_")[1], 10) : null,
+        name: item.querySelector(".inventory_item_name").innerText.trim(),
+        price: item.querySelector(".inventory_item_price").innerText.trim(),
+        in_cart: button ? button.id.startsWith("remove") : false,
+        button: button,
+    };
+});
+"""
+
+SORT_KEYS = {
+    "name": lambda product: product.name,
+    "price": lambda product: product.price,
+    "position": lambda product: product.position,
+}
+
+
+class ProductCatalog:
+    """
+    The inventory page read once into an index by name and by id.
+
+    Lookups, sorted views and order checks are computed from that one read.
+    Adding or removing through the catalog updates it in place. The read is
+    taken again after any page object navigated the browser or seeded the
+    cart since (BasePage.mark_page_changed); anything else that reorders the
+    listing must call ``invalidate`` (ProductsPage.sort_by does).
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self._products = None
+        self._read_at = None
+        self.reads = 0
+
+    def invalidate(self):
+        self._products = None
+
+    @property
+    def products(self):
+        """Products in the order the page lists them"""
+        if self._read_at != self.page.page_changes():
+            self.invalidate()
+        if self._products is None:
+            def read(driver):
+                # WebDriver rather than page.backend: the buttons come back as WebElements
+                self.reads += 1
+                return driver.execute_script(CATALOG_SCRIPT)
+            read.description = "inventory rendered"
+            rows = self.page.wait_until(read, profile="element")
+            self._products = [
+                Product(row["id"], row["name"], float(row["price"].replace("$", "")), position,
+                        row["in_cart"], row["button"])
+                for position, row in enumerate(rows)
+            ]
+            self._read_at = self.page.page_changes()
+        return self._products
+
+    def get(self, key):
+        """Product by name or id"""
+        for product in self.products:
+            if key == product.name or key == product.id:
+                return product
+        raise KeyError(f"No product {key!r} on the inventory page")
+
+    def names(self):
+        return [product.name for product in self.products]
+
+    def prices(self):
+        return [product.price for product in self.products]
+
+    def in_cart(self):
+        return [product for product in self.products if product.in_cart]
+
+    def sorted_by(self, key="price", reverse=False):
+        return sorted(self.products, key=SORT_KEYS[key], reverse=reverse)
+
+    def is_sorted(self, key="price", reverse=False):
+        """Whether the page lists the products in ``key`` order - checked locally, no extra read"""
+        return self.products == self.sorted_by(key, reverse)
+
+    def add(self, *keys):
+        """Add products (by name or id) that aren't in the cart yet"""
+        for key in keys:
+            self._toggle(key, want_in_cart=True)
+
+    def remove(self, *keys):
+        for key in keys:
+            self._toggle(key, want_in_cart=False)
+
+    def _toggle(self, key, want_in_cart):
+        product = self.get(key)
+        if product.in_cart == want_in_cart:
+            return
+        try:
+            product.button.click()
+        except StaleElementReferenceException:
+            # The listing re-rendered since it was read
+            self.invalidate()
+            product = self.get(key)
+            if product.in_cart == want_in_cart:
+                return
+            product.button.click()
+        self._products[product.position] = product._replace(in_cart=want_in_cart)
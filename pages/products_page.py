@@ -1,8 +1,35 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select
-from selenium.webdriver.support import expected_conditions as EC
-from pages.base_page import BasePage
-import time
+from pages.base_page import BasePage, animations_finished, dom_settled, network_idle
+from pages.product_catalog import ProductCatalog
+from pages.transitions import TransitionEngine
+
+# SauceDemo item ids as used in the cart state and the item_<id>_title_link anchors
+PRODUCT_IDS = {
+    "Sauce Labs Backpack": 4,
+    "Sauce Labs Bike Light": 0,
+    "Sauce Labs Bolt T-Shirt": 1,
+    "Sauce Labs Fleece Jacket": 5,
+    "Sauce Labs Onesie": 2,
+    "Test.allTheThings() T-Shirt (Red)": 3,
+}
+
+# The first two products on the default (A to Z) listing - what add_items_to_cart(2) picks
+DEFAULT_CART = (4, 0)
+
+# {alt: loaded} for every product image, or null while any of them is still loading.
+# A blocked image is "complete" with no pixels, just like a broken one.
+IMAGES_SCRIPT = """
+const images = Array.from(document.querySelectorAll(arguments[0]));
+if (!images.length || images.some(image => !image.complete)) {
+    return null;
+}
+const loaded = {};
+for (const image of images) {
+    loaded[image.alt] = image.naturalWidth > 0;
+}
+return loaded;
+"""
 
 
 class ProductsPage(BasePage):
@@ -11,16 +38,36 @@ class ProductsPage(BasePage):
     CART_BADGE = (By.CLASS_NAME, "shopping_cart_badge")
     CART_ICON = (By.CLASS_NAME, "shopping_cart_link")
     PRICES = (By.CLASS_NAME, "inventory_item_price")
+    IMAGES = (By.CSS_SELECTOR, ".inventory_item img")
     MENU_BTN = (By.ID, "react-burger-menu-btn")
     LOGOUT_BTN = (By.ID, "logout_sidebar_link")
 
+    def __init__(self, driver):
+        super().__init__(driver)
+        # Read lazily on first use, then kept until the listing or the cart changes
+        self.catalog = ProductCatalog(self)
+
+    def sort_by(self, order):
+        """Pick a sort order: "az", "za", "lohi" or "hilo" """
+        Select(self.wait_for_visible(self.SORT_DROPDOWN)).select_by_value(order)
+        # The listing re-renders in place: read it again once React is done
+        self.wait_until(dom_settled(), profile="element")
+        self.catalog.invalidate()
+
     def sort_low_to_high(self):
-        Select(self.wait_for_visible(self.SORT_DROPDOWN)).select_by_value("lohi")
+        self.sort_by("lohi")
 
     def add_items_to_cart(self, count=2):
-        buttons = self.driver.find_elements(*self.ADD_TO_CART_BTNS)
-        for i in range(count):
-            buttons[i].click()
+        """Add the first ``count`` listed products that aren't in the cart yet"""
+        for product in [p for p in self.catalog.products if not p.in_cart][:count]:
+            self.catalog.add(product.id)
+
+    def add_to_cart(self, *products):
+        """Add products by name or id"""
+        self.catalog.add(*products)
+
+    def remove_from_cart(self, *products):
+        self.catalog.remove(*products)
 
     def add_products(self, count=1):
         """Alias for add_items_to_cart"""
@@ -34,17 +81,25 @@ class ProductsPage(BasePage):
         return self.get_cart_count()
 
     def go_to_cart(self):
-        # Navigate directly to cart page (more reliable than clicking)
-        self.driver.get("https://www.saucedemo.com/cart.html")
-
-        # Wait for cart page to load
-        self.wait.until(EC.url_contains("cart"))
+        # Direct navigation unless the test forces the real cart link (see pages/transitions.py)
+        TransitionEngine(self).move("cart")
 
     def get_prices(self):
-        return [float(p.text.replace("$", "")) for p in self.driver.find_elements(*self.PRICES)]
+        return self.catalog.prices()
+
+    def get_image_status(self):
+        """{product name: whether its image loaded}; the lean profile blocks them all"""
+        def settled(driver):
+            return self.backend.execute_script(IMAGES_SCRIPT, self.IMAGES[1])
+        settled.description = "product images settled"
+        # Blocked images fail as requests too: let them all finish first
+        self.wait_until(network_idle(), profile="navigation")
+        return self.wait_until(settled, profile="element")
 
     def logout(self):
         self.click(self.MENU_BTN)
-        # Wait for menu to slide out and logout button to be visible
-        time.sleep(0.5)
-        self.click(self.LOGOUT_BTN)
\ No newline at end of file
+        # Wait for the menu to finish sliding out before clicking inside it
+        self.wait_for_visible(self.LOGOUT_BTN)
+        self.wait_until(animations_finished(), profile="animation")
+        self.click(self.LOGOUT_BTN)
+        self.mark_page_changed()
\ No newline at end of file
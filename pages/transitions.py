@@ -0,0 +1,202 @@
+from collections import deque, namedtuple
+
+from selenium.webdriver.common.by import By
+from pages.base_page import url_contains
+from utils.config import app_url
+
+# The checkout flow as a state machine: state -> page path
+STATES = {
+    "login": "",
+    "inventory": "inventory.html",
+    "cart": "cart.html",
+    "step_one": "checkout-step-one.html",
+    "step_two": "checkout-step-two.html",
+    "complete": "checkout-complete.html",
+}
+
+# Ways to take an edge, cheapest first
+STRATEGIES = ("inject", "navigate", "ui")
+
+# ``button`` is what a user clicks; ``name`` lets a page follow e.g. "cancel" from wherever it is;
+# ``form`` names the input the click needs on the page first, which only the caller can supply
+Edge = namedtuple("Edge", "source target button strategies name form", defaults=(None,))
+
+EDGES = [
+    Edge("login", "inventory", (By.ID, "login-button"), ("inject", "ui"), "login"),
+    Edge("inventory", "cart", (By.CLASS_NAME, "shopping_cart_link"), ("navigate", "ui"), "cart"),
+    Edge("cart", "inventory", (By.ID, "continue-shopping"), ("navigate", "ui"), "continue shopping"),
+    Edge("cart", "step_one", (By.ID, "checkout"), ("navigate", "ui"), "checkout"),
+    Edge("step_one", "cart", (By.ID, "cancel"), ("navigate", "ui"), "cancel"),
+    # Navigating skips the form; clicking needs it filled (CheckoutPage.fill_checkout_info)
+    Edge("step_one", "step_two", (By.ID, "continue"), ("navigate", "ui"), "continue", "checkout information"),
+    Edge("step_two", "inventory", (By.ID, "cancel"), ("navigate", "ui"), "cancel"),
+    Edge("step_two", "complete", (By.ID, "finish"), ("navigate", "ui"), "finish"),
+    Edge("complete", "inventory", (By.ID, "back-to-products"), ("navigate", "ui"), "back home"),
+]
+
+# The only way into the flow
+LOGIN_EDGE = EDGES[0]
+
+
+class TransitionError(Exception):
+    """The requested move can't be made the way the test asked for"""
+
+
+def edge_name(edge):
+    return f"{edge.source}->{edge.target}"
+
+
+def state_for(path):
+    """Flow state of an application page path such as "cart.html" """
+    for state, state_path in STATES.items():
+        if state_path == path:
+            return state
+    raise ValueError(f"{path!r} is not a page of the modelled flow: {sorted(STATES.values())}")
+
+
+def current_state(driver):
+    """Flow state of the page the browser is on, or None outside the modelled flow"""
+    url = driver.current_url.split("?")[0].split("#")[0]
+    page = url.rsplit("/", 1)[-1]
+    # The mock serves its login form as index.html too (where its logout lands)
+    if url == app_url() or url == app_url("index.html"):
+        return "login"
+    for state, path in STATES.items():
+        if path and page == path:
+            return state
+    return None
+
+
+def shortest_path(source, target):
+    """Edges leading from ``source`` to ``target`` (breadth first), or None"""
+    paths = {source: []}
+    queue = deque([source])
+    while queue:
+        state = queue.popleft()
+        if state == target:
+            return paths[state]
+        for edge in EDGES:
+            if edge.source == state and edge.target not in paths:
+                paths[edge.target] = paths[state] + [edge]
+                queue.append(edge.target)
+    return None
+
+
+class TransitionEngine:
+    """
+    Moves a page's browser through the checkout flow, taking every edge the
+    cheapest valid way: session injection, direct navigation or a real click.
+    A run of edges that can be skipped through the address bar costs one
+    page load, to the last of them.
+
+    Edges a test is about are forced through the UI with
+    ``@pytest.mark.ui_edges("cart->step_one", ...)`` (no arguments: every edge);
+    the driver fixture puts them on ``driver.ui_edges``. Every edge taken is
+    appended to ``driver.transitions`` when the fixture set it up, which is
+    what the "state transitions" summary is built from.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.driver = page.driver
+
+    def strategy(self, edge):
+        forced = getattr(self.driver, "ui_edges", None)
+        if forced is not None and (not forced or edge_name(edge) in forced):
+            return "ui"
+        return next(s for s in STRATEGIES if s in edge.strategies)
+
+    def move(self, target, username="standard_user", password="secret_sauce", form_ready=False):
+        """
+        Go to state ``target`` along the shortest path from the current state.
+        ``form_ready``: the caller has filled the current page's form, so its
+        edge may be clicked. Raises TransitionError, before moving at all, when
+        a click would need input the engine doesn't have.
+        """
+        source = current_state(self.driver)
+        if source is None:
+            # Outside the modelled flow, e.g. the mock's index.html after a logout: the
+            # session may be gone, so go on as from the login page. Only a login form
+            # to fill (or the login page itself) needs the page actually opened.
+            if target == "login" or self.strategy(LOGIN_EDGE) == "ui":
+                self.page.open(STATES["login"])
+                self._record("?->login", "navigate")
+            source = "login"
+        if source == target:
+            return
+        path = shortest_path(source, target)
+        if path is None:
+            # No edge leads there (back to the login page): the only way is the address bar
+            self.page.open(STATES[target])
+            self._record(f"{source}->{target}", "navigate")
+            return
+
+        strategies = [self.strategy(edge) for edge in path]
+        for position, (edge, strategy) in enumerate(zip(path, strategies)):
+            self._check_form(edge, strategy, form_ready and position == 0)
+
+        position = 0
+        while position < len(path):
+            if strategies[position] == "ui":
+                self.take(path[position], username, password, form_ready=form_ready and position == 0)
+                position += 1
+                continue
+            end = position + 1
+            while end < len(path) and strategies[end] == "navigate":
+                end += 1
+            self._jump(path[position:end], strategies[position:end], username, password)
+            position = end
+
+    def follow(self, name, form_ready=False):
+        """Take the edge called ``name`` (e.g. "cancel") from the current state; False if there is none"""
+        source = current_state(self.driver)
+        for edge in EDGES:
+            if edge.source == source and edge.name == name:
+                self.take(edge, form_ready=form_ready)
+                return True
+        return False
+
+    def take(self, edge, username="standard_user", password="secret_sauce", form_ready=False):
+        strategy = self.strategy(edge)
+        self._check_form(edge, strategy, form_ready)
+        if strategy != "ui":
+            self._jump([edge], [strategy], username, password)
+            return
+
+        if edge.name == "login":
+            self._login_page().login(username, password)
+        else:
+            self.page.click(edge.button)
+        self.page.wait_until(url_contains(STATES[edge.target]), profile="navigation")
+        self.page.mark_page_changed()
+        self._record(edge_name(edge), strategy)
+
+    def _jump(self, edges, strategies, username, password):
+        """Skip ``edges`` (an optional injected login, then navigations) with one page load"""
+        target = edges[-1].target
+        if strategies[0] == "inject":
+            if not self._login_page().inject_session(username, password):
+                # No session to inject yet: it was captured from a real login
+                strategies = ["ui"] + list(strategies[1:])
+        if current_state(self.driver) != target:
+            self.page.open(STATES[target])
+        self.page.wait_until(url_contains(STATES[target]), profile="navigation")
+        for edge, strategy in zip(edges, strategies):
+            self._record(edge_name(edge), strategy)
+
+    def _check_form(self, edge, strategy, form_ready):
+        if strategy == "ui" and edge.form and not form_ready:
+            raise TransitionError(
+                f"{edge_name(edge)} is forced through the UI but needs {edge.form} filled in first, "
+                f"which the transition engine doesn't have (CheckoutPage.fill_checkout_info supplies it)"
+            )
+
+    def _login_page(self):
+        # pages.login_page routes login_fast through this module
+        from pages.login_page import LoginPage
+        return LoginPage(self.driver)
+
+    def _record(self, edge, strategy):
+        transitions = getattr(self.driver, "transitions", None)
+        if transitions is not None:
+            transitions.append((edge, strategy))
@@ -0,0 +1,44 @@
+from collections import namedtuple
+
+# Seconds each kind of wait may block. Pages override entries through BasePage.TIMEOUTS,
+# single calls through the ``timeout=`` argument of BasePage.wait_until.
+DEFAULT_TIMEOUTS = {
+    "default": 10,      # element waits behind click/type/wait_for_* and self.wait
+    "navigation": 10,   # page loads and URL changes
+    "element": 5,       # an element expected on the current page
+    "error": 3,         # validation messages that should render right away
+    "animation": 2,     # CSS transitions such as the burger menu
+}
+
+TimeoutHit = namedtuple("TimeoutHit", "test page description timeout")
+
+# Every wait that ran out of time during the session, for the terminal summary
+timeout_hits = []
+
+# Node id of the running test, set by the conftest hooks
+current_test = None
+
+
+class WaitPolicy:
+    """
+    Resolves timeout profiles for one page object.
+
+    There is deliberately no implicit wait anywhere: the driver runs with
+    ``implicitly_wait(0)`` so an absence check (``find_elements`` returning
+    nothing) answers immediately instead of silently paying the implicit
+    timeout on top of the explicit one.
+    """
+
+    def __init__(self, overrides=None):
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        self.timeouts.update(overrides or {})
+
+    def timeout(self, profile="default"):
+        try:
+            return self.timeouts[profile]
+        except KeyError:
+            raise ValueError(f"Unknown wait profile: {profile!r}") from None
+
+
+def record_timeout(page, description, timeout):
+    timeout_hits.append(TimeoutHit(current_test, page, description, timeout))
@@ -1,32 +1,483 @@
-import pytest
 import os
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+import pytest
+import time
+
+from pages import wait_policy
+from pages.backends import BACKENDS
+from pages.base_page import BasePage, ElementCacheStats, element_cache
+from pages.login_page import LoginPage
+from mock_app.server import MockServer
+from pages.products_page import DEFAULT_CART
+from utils import durations, flaky, impact, lean_profile
+from utils.artifacts import DEFAULT_BUDGET_MB, ArtifactStore
+from utils.browser_pool import BrowserPool
+from utils.checkpoints import FlowCheckpoints
+from utils.config import app_url, get_base_url, set_base_url
+from utils.contexts import BrowserContexts
+from utils.instrumentation import InstrumentationPlugin
+from utils.paths import REPORTS_DIR
+from utils.results import ResultSink
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--max-browser-uses",
+        type=int,
+        default=50,
+        help="Restart a pooled browser after it has served this many tests",
+    )
+    parser.addoption(
+        "--app-url",
+        default=None,
+        help="Base URL of the application under test (default: $SAUCEDEMO_URL or https://www.saucedemo.com/)",
+    )
+    parser.addoption(
+        "--local-app",
+        action="store_true",
+        help="Serve the bundled mock SauceDemo from a local HTTP server and test against it",
+    )
+    parser.addoption(
+        "--backend",
+        choices=sorted(BACKENDS),
+        default="webdriver",
+        help="How page objects run scripts and navigation: classic WebDriver or DevTools (cdp) websocket",
+    )
+    parser.addoption(
+        "--no-lean-browser",
+        action="store_true",
+        help="Use a full Chrome profile: load images/fonts/analytics and keep animations",
+    )
+    parser.addoption(
+        "--instrument",
+        action="store_true",
+        help="Record every WebDriver command and wait per test (reports/timelines/, HTML report, summary)",
+    )
+    parser.addoption(
+        "--artifact-budget",
+        type=int,
+        default=DEFAULT_BUDGET_MB,
+        help="MB of failure artifacts (screenshots, DOM, console logs) to keep per worker; oldest go first",
+    )
+    parser.addoption(
+        "--record-impact",
+        action="store_true",
+        help="Record which page-object methods each test runs, for --impact",
+    )
+    parser.addoption(
+        "--impact",
+        action="store_true",
+        help="Only run tests affected by changes since the last --record-impact run (full run if unsure)",
+    )
+    parser.addoption(
+        "--retries",
+        type=int,
+        default=0,
+        help="Re-run a failed test up to this many times in the same process (warm browser)",
+    )
+    parser.addoption(
+        "--flaky-lane",
+        choices=flaky.LANES,
+        default="all",
+        help="'stable' leaves out quarantined flaky tests, 'quarantine' runs only them",
+    )
+    parser.addoption(
+        "--no-results-log",
+        action="store_true",
+        help="Don't stream per-phase JSON lines to reports/results/",
+    )
+    parser.addoption(
+        "--no-duration-order",
+        action="store_true",
+        help="Keep file order under xdist instead of scheduling the historically slowest tests first",
+    )
+    parser.addoption(
+        "--failing-first",
+        action="store_true",
+        help="Run the tests that failed most often recently first (then longest first)",
+    )
+    parser.addoption(
+        "--time-budget",
+        type=float,
+        default=None,
+        metavar="MINUTES",
+        help="Only run the most valuable tests (recent failures, new tests) that fit in this many minutes",
+    )
+
+
+def _is_worker(config):
+    return hasattr(config, "workerinput")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    if config.getoption("--instrument"):
+        config.pluginmanager.register(InstrumentationPlugin(), "instrumentation")
+    config.pluginmanager.register(
+        flaky.FlakyPlugin(config, config.getoption("--retries"), config.getoption("--flaky-lane")), "flaky"
+    )
+    if not config.getoption("--no-results-log"):
+        config.pluginmanager.register(ResultSink(config), "result_sink")
+    if config.getoption("--record-impact"):
+        config.pluginmanager.register(impact.ImpactRecorder(), "impact_recorder")
+
+    # Parallel runs always get one merged report: pytest-html only writes it
+    # from the controller, which receives every worker's results
+    if config.getoption("numprocesses", None) and not _is_worker(config):
+        if config.pluginmanager.hasplugin("html") and not config.getoption("htmlpath"):
+            config.option.htmlpath = f"{REPORTS_DIR}/report.html"
+            config.option.self_contained_html = True
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--impact"):
+        config.impact_reason = impact.select_items(config, items)
+
+    budget = config.getoption("--time-budget")
+    failing_first = config.getoption("--failing-first")
+    reorder = failing_first or (_is_worker(config) and not config.getoption("--no-duration-order"))
+    if budget is None and not reorder:
+        return
+
+    # Only workers collect under xdist; they all read the same history, so they
+    # agree on the selection and order as xdist requires
+    history = durations.load(config)
+    if budget is not None:
+        workers = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", 1))
+        selected, deselected, estimate = durations.within_budget(items, history, budget * 60, workers)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+        config.budget_summary = f"{len(selected)} tests selected, estimated {estimate / 60:.1f} min"
+
+    if reorder:
+        durations.longest_first(items, history, failing_first)
+
+
+@pytest.fixture(scope="session")
+def app_base_url(request):
+    """Base URL every page object navigates under; starts the local mock with --local-app"""
+    if request.config.getoption("--local-app"):
+        server = MockServer().start()
+        set_base_url(server.url)
+        yield server.url
+        server.stop()
+        return
+
+    if request.config.getoption("--app-url"):
+        set_base_url(request.config.getoption("--app-url"))
+    yield get_base_url()
+
+
+@pytest.fixture(scope="session")
+def browser_pool(request, app_base_url):
+    # Session scope means one pool per xdist worker process, so workers never share a browser
+    pool = BrowserPool(
+        max_uses=request.config.getoption("--max-browser-uses"),
+        lean=not request.config.getoption("--no-lean-browser"),
+    )
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def failure_artifacts(request):
+    store = ArtifactStore(budget_bytes=request.config.getoption("--artifact-budget") * 2**20)
+    yield store
+    store.close()
+
+
+def _full_browser(request):
+    # Visual checks opt out of resource blocking with @pytest.mark.full_browser
+    return bool(request.node.get_closest_marker("full_browser"))
+
+
+def _start_test(request, driver):
+    """Per-test setup of a leased browser: instrumentation and the test's markers"""
+    recorder = getattr(request.node, "recorder", None)
+    if recorder:
+        recorder.attach(driver)
+
+    # @pytest.mark.backend("cdp") on a test wins over --backend
+    marker = request.node.get_closest_marker("backend")
+    backend = marker.args[0] if marker else request.config.getoption("--backend")
+    if backend != "webdriver":
+        driver.page_backend = BACKENDS[backend](driver)
+    # Tests about typing itself get real keystrokes from BasePage.fill_form
+    if request.node.get_closest_marker("real_typing"):
+        driver.input_mode = "keys"
+    # Flow edges the test is about go through the UI (pages/transitions.py); all taken edges are reported
+    ui_edges = request.node.get_closest_marker("ui_edges")
+    if ui_edges:
+        driver.ui_edges = set(ui_edges.args)
+    driver.transitions = []
+
+
+def _finish_test(request, driver, failure_artifacts):
+    """Keep the test's failure evidence and the flow edges it took"""
+    # No rep_call when setup failed
+    rep_call = getattr(request.node, "rep_call", None)
+    if rep_call is not None and rep_call.failed:
+        # Only the raw capture happens here; encoding and writing run in the background
+        captured = failure_artifacts.capture(driver)
+        request.node.user_properties.append(("artifacts", captured))
+        request.node.add_report_section(
+            "teardown", "failure artifacts", "\n".join(f"{kind}: {path}" for kind, path in captured.items())
+        )
+
+    transitions = getattr(driver, "transitions", None)
+    if transitions:
+        request.node.user_properties.append(("transitions", transitions))
+
+
+def _clear_test(request, driver):
+    """Undo _start_test, also after it failed half-way; the browser stays leased"""
+    driver.__dict__.pop("input_mode", None)
+    driver.__dict__.pop("ui_edges", None)
+    driver.__dict__.pop("transitions", None)
+    page_backend = driver.__dict__.pop("page_backend", None)
+    if page_backend:
+        page_backend.close()
+    recorder = getattr(request.node, "recorder", None)
+    if recorder:
+        recorder.detach(driver)
+
+
+@pytest.fixture
+def driver(request, browser_pool, failure_artifacts):
+    launched = browser_pool.launched
+    start = time.monotonic()
+    driver = browser_pool.acquire(lean=False if _full_browser(request) else None)
+
+    recorder = getattr(request.node, "recorder", None)
+    if recorder:
+        # A lease that had to launch Chrome is the browser startup cost
+        recorder.record_event("browser_lease", time.monotonic() - start, launched=browser_pool.launched > launched)
+
+    # Whatever goes wrong in setup or teardown, the browser goes back to the pool
+    # without the test's settings
+    try:
+        _start_test(request, driver)
+        yield driver
+        _finish_test(request, driver, failure_artifacts)
+    finally:
+        _clear_test(request, driver)
+        browser_pool.release(driver)
+
+
+@pytest.fixture(scope="session")
+def context_host(browser_pool):
+    """One pooled browser that hands out isolated browser contexts (see utils/contexts.py)"""
+    driver = browser_pool.acquire()
+    contexts = BrowserContexts(driver)
+    yield contexts
+    contexts.close()
+    browser_pool.release(driver)
 
 
 @pytest.fixture
-def driver(request):
-    options = Options()
-    options.add_argument("--headless=new")
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
+def context_driver(request, context_host, failure_artifacts):
+    """
+    Driver for a fresh browser context (own cookies and storage) inside a shared Chrome,
+    parked on the login page. Much cheaper in memory than a browser of its own.
+    Gets the driver fixture's per-test handling.
+    """
+    driver = context_host.new_context(app_url())
+    try:
+        _start_test(request, driver)
+        yield driver
+        _finish_test(request, driver, failure_artifacts)
+    finally:
+        _clear_test(request, driver)
+        context_host.close_context(driver.target_id)
 
-    driver = webdriver.Chrome(options=options)
-    driver.get("https://www.saucedemo.com/")
-    driver.implicitly_wait(2)
 
+@pytest.fixture(scope="module")
+def login_browser(browser_pool):
+    """One browser for every row of a login matrix in the module"""
+    driver = browser_pool.acquire()
     yield driver
+    browser_pool.release(driver)
+
+
+@pytest.fixture
+def login_form(request, login_browser, browser_pool, failure_artifacts):
+    """
+    LoginPage on an empty form of the module's shared browser - no page reload between rows.
+    Each row gets the driver fixture's per-test handling: markers, --instrument timeline
+    and failure artifacts.
+    """
+    lean = not _full_browser(request) and browser_pool.lean
+    if (getattr(login_browser, "lean_profile", None) is not None) != lean:
+        # Only a reload shows the row the profile it asked for
+        lean_profile.apply(login_browser, lean)
+        login_browser.delete_all_cookies()
+        login_browser.get(app_url())
+
+    try:
+        _start_test(request, login_browser)
+        login = LoginPage(login_browser)
+        login.reset_form()
+        yield login
+        _finish_test(request, login_browser, failure_artifacts)
+    finally:
+        _clear_test(request, login_browser)
+
+
+@pytest.fixture
+def logged_in_driver(driver):
+    """Driver already on the inventory page as standard_user (session cookie injected)"""
+    LoginPage(driver).login_fast("standard_user")
+    return driver
+
+
+@pytest.fixture
+def open_with_cart(driver):
+    """
+    Factory that lands the test on ``page`` (e.g. "cart.html", "checkout-step-one.html")
+    logged in as standard_user with ``item_ids`` already in the cart - no add-to-cart clicks.
+    """
+    def _open(page="cart.html", item_ids=DEFAULT_CART):
+        # The pooled browser is parked on the login page, so localStorage is writable
+        BasePage(driver).seed_cart(item_ids)
+        LoginPage(driver).login_fast("standard_user", landing=page)
+        return driver
+
+    return _open
+
+
+@pytest.fixture(scope="module")
+def flow_checkpoints(browser_pool):
+    checkpoints = FlowCheckpoints(browser_pool)
+    yield checkpoints
+    checkpoints.close()
+
+
+@pytest.fixture
+def flow(flow_checkpoints):
+    """
+    Named flow checkpoints ("cart with 2 items", "checkout step one", "checkout step two"),
+    each reached once per module. ``flow.view(name)`` returns a shared browser for read-only
+    tests; ``flow.fork(driver, name)`` puts the checkpoint into the test's own browser.
+    """
+    yield flow_checkpoints
+    flow_checkpoints.check_untouched()
+
 
-    if request.node.rep_call.failed:
-        os.makedirs("screenshots", exist_ok=True)
-        driver.save_screenshot(f"screenshots/{request.node.name}.png")
+# Element cache counters and timed-out waits already handed to a report (per process)
+_cache_reported = (0, 0, 0)
+_hits_reported = 0
 
-    driver.quit()
+
+def _report_page_stats(item):
+    """
+    Put what this process's page objects counted since the previous test's teardown
+    onto the test's reports; under xdist that is the only way it reaches the controller.
+    """
+    global _cache_reported, _hits_reported
+    counts = (element_cache.hits, element_cache.misses, element_cache.stale)
+    delta = [now - before for now, before in zip(counts, _cache_reported)]
+    _cache_reported = counts
+    if any(delta):
+        item.user_properties.append(("element_cache", delta))
+
+    hits = wait_policy.timeout_hits[_hits_reported:]
+    _hits_reported = len(wait_policy.timeout_hits)
+    if hits:
+        item.user_properties.append(("timeout_hits", [list(hit) for hit in hits]))
 
 
 @pytest.hookimpl(hookwrapper=True)
-def pytest_runtest_makereport(item):
+def pytest_runtest_makereport(item, call):
+    if call.when == "teardown":
+        _report_page_stats(item)
     outcome = yield
     rep = outcome.get_result()
-    setattr(item, "rep_" + rep.when, rep)
\ No newline at end of file
+    setattr(item, "rep_" + rep.when, rep)
+
+
+def pytest_runtest_logstart(nodeid):
+    wait_policy.current_test = nodeid
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if getattr(config, "impact_reason", None):
+        terminalreporter.write_line(f"impact selection: {config.impact_reason}")
+    if getattr(config, "budget_summary", None):
+        terminalreporter.write_line(f"time budget: {config.budget_summary}")
+
+    cache = ElementCacheStats()
+    for hits, misses, stale in _element_cache.values():
+        cache.hits += hits
+        cache.misses += misses
+        cache.stale += stale
+    if cache.lookups:
+        terminalreporter.write_line(
+            f"element cache: {cache.hits}/{cache.lookups} lookups hit "
+            f"({cache.hit_rate:.0%}), {cache.round_trips_saved} round-trips saved, "
+            f"{cache.stale} stale handles"
+        )
+
+    if _transitions:
+        terminalreporter.section("state transitions")
+        taken = {}
+        for test, pairs in _transitions.items():
+            for edge, strategy in pairs:
+                taken.setdefault(edge, {}).setdefault(strategy, set()).add(test)
+        for edge, strategies in sorted(taken.items()):
+            counts = ", ".join(f"{strategy} in {len(tests)} test(s)" for strategy, tests in sorted(strategies.items()))
+            terminalreporter.write_line(f"{edge:<22} {counts}")
+            for test in sorted(strategies.get("ui", ())):
+                terminalreporter.write_line(f"{'':<22} ui: {test}")
+
+    if not _timeout_hits:
+        return
+    terminalreporter.section("waits that hit their timeout")
+    for hit in (wait_policy.TimeoutHit(*hit) for hits in _timeout_hits.values() for hit in hits):
+        terminalreporter.write_line(f"{hit.test}: {hit.page} waited {hit.timeout}s for {hit.description}")
+
+
+# Setup + call + teardown seconds per test in this run, and the tests that failed
+# (controller/serial process only)
+_measured = {}
+_failed = set()
+
+# Page-object functions each test ran, with --record-impact (controller/serial process only)
+_impact = {}
+
+# (edge, strategy) pairs each test's page objects took through the checkout flow
+_transitions = {}
+
+# Element cache [hits, misses, stale] and timed-out waits per test, from the reports'
+# user properties so parallel runs add up every worker's (controller/serial process only)
+_element_cache = {}
+_timeout_hits = {}
+
+
+def pytest_runtest_logreport(report):
+    if report.passed or report.failed:
+        # Every attempt starts with setup: a retried test counts its last attempt only
+        earlier = 0 if report.when == "setup" else _measured.get(report.nodeid, 0)
+        _measured[report.nodeid] = earlier + report.duration
+    if report.failed:
+        _failed.add(report.nodeid)
+    for name, value in report.user_properties:
+        if name == "impact":
+            _impact[report.nodeid] = value
+        elif name == "transitions":
+            _transitions[report.nodeid] = [tuple(pair) for pair in value]
+    # A report carries the entries of every attempt so far (retries append to the same list)
+    cache_counts = [value for name, value in report.user_properties if name == "element_cache"]
+    if cache_counts:
+        _element_cache[report.nodeid] = [sum(column) for column in zip(*cache_counts)]
+    hits = [hit for name, value in report.user_properties if name == "timeout_hits" for hit in value]
+    if hits:
+        _timeout_hits[report.nodeid] = hits
+
+
+def pytest_sessionfinish(session):
+    if _is_worker(session.config):
+        return
+    if _measured:
+        durations.save(session.config, _measured, _failed)
+    if _impact:
+        impact.save(session.config, _impact)
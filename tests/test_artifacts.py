@@ -0,0 +1,20 @@
+import os
+
+from utils.artifacts import ArtifactStore
+
+
+# TC01 – Verify eviction keeps the store under budget and leaves worker sub-directories alone (no browser)
+
+def test_budget_skips_subdirectories(tmp_path):
+    worker_dir = tmp_path / "gw0"
+    worker_dir.mkdir()
+    (worker_dir / "kept.png").write_bytes(b"x" * 1000)
+
+    store = ArtifactStore(root=str(tmp_path), budget_bytes=250, workers=1)
+    paths = [store.add(str(n) * 100, ".txt", str.encode) for n in range(4)]
+    store.close()
+
+    # Only the newest files at the root count against the budget
+    assert store.evicted == 2
+    assert [os.path.exists(path) for path in paths] == [False, False, True, True]
+    assert (worker_dir / "kept.png").exists()
@@ -1,10 +1,12 @@
+import pytest
+
 from pages.login_page import LoginPage
 from pages.products_page import ProductsPage
 from pages.cart_page import CartPage
 
 
 def login_and_add_product(driver, count=1):
-    LoginPage(driver).login("standard_user", "secret_sauce")
+    LoginPage(driver).login_fast("standard_user")
     products = ProductsPage(driver)
     products.add_products(count)
     products.go_to_cart()
@@ -19,42 +21,59 @@ def test_cart_page_navigation(driver):
 
 # TC02 – Verify Cart page title
 
-def test_cart_page_title(driver):
-    login_and_add_product(driver)
+def test_cart_page_title(flow):
+    driver = flow.view("cart with 2 items")
     cart = CartPage(driver)
     assert cart.get_title() == "Your Cart"
 
 
 # TC03 – Verify added products displayed in Cart
 
-def test_cart_items_displayed(driver):
-    login_and_add_product(driver, 2)
+def test_cart_items_displayed(flow):
+    driver = flow.view("cart with 2 items")
     cart = CartPage(driver)
     assert cart.get_cart_items_count() == 2
 
+    names = {name for name, _ in cart.get_cart_items()}
+    assert names == {"Sauce Labs Backpack", "Sauce Labs Bike Light"}
+
 
 # TC04 – Remove single product from Cart
 
-def test_remove_single_item(driver):
-    login_and_add_product(driver, 1)
+def test_remove_single_item(open_with_cart):
+    driver = open_with_cart("cart.html", [4])
     cart = CartPage(driver)
     cart.remove_first_item()
     assert cart.get_cart_items_count() == 0
+    assert not cart.has_cart_badge()
+
+
+# TC05 – Remove every product from Cart
+
+def test_remove_all_items(open_with_cart):
+    driver = open_with_cart("cart.html")
+    cart = CartPage(driver)
+    cart.remove_all_items()
+    assert cart.get_cart_items_count() == 0
+    assert not cart.has_cart_badge()
+
 
 # TC06 – Continue Shopping button
 
-def test_continue_shopping(driver):
-    login_and_add_product(driver, 1)
+@pytest.mark.ui_edges("cart->inventory")
+def test_continue_shopping(open_with_cart):
+    driver = open_with_cart("cart.html", [4])
     cart = CartPage(driver)
     cart.click_continue_shopping()
     assert "inventory" in driver.current_url
 
 
 
-# TC07 – Checkout navigation
+# TC07 – Checkout navigation (cart seeding, cookie login and navigation over DevTools)
 
-def test_checkout_navigation(driver):
-    login_and_add_product(driver, 1)
+@pytest.mark.backend("cdp")
+def test_checkout_navigation(open_with_cart):
+    driver = open_with_cart("cart.html", [4])
     cart = CartPage(driver)
     cart.click_checkout()
     assert "checkout" in driver.current_url
\ No newline at end of file
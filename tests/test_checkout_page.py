@@ -1,3 +1,5 @@
+import pytest
+
 from pages.login_page import LoginPage
 from pages.products_page import ProductsPage
 from pages.cart_page import CartPage
@@ -6,35 +8,20 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 
-def navigate_to_checkout(driver):
-    """Helper function: Login → Add products → Go to cart → Click checkout"""
-    # Step 1: Login with correct credentials
-    LoginPage(driver).login("standard_user", "secret_sauce")
-
-    # Step 2: Add 2 products to cart
-    products = ProductsPage(driver)
-    products.add_products(2)
-
-    # Step 3: Go to cart
-    products.go_to_cart()
-
-    # Step 4: Click checkout button
-    CartPage(driver).click_checkout()
-
-
 # TC01 – Navigate to Checkout page (Step One)
-def test_checkout_navigation(driver):
+def test_checkout_navigation(flow):
     """Test: Verify user reaches checkout step one"""
-    navigate_to_checkout(driver)
+    driver = flow.view("checkout step one")
     checkout = CheckoutPage(driver)
     assert checkout.is_on_step_one()
     assert "checkout-step-one" in driver.current_url
 
 
 # TC02 – Valid checkout information → Step Two
-def test_checkout_valid_information(driver):
+@pytest.mark.ui_edges("step_one->step_two")
+def test_checkout_valid_information(driver, flow):
     """Test: Fill checkout info and proceed to step two"""
-    navigate_to_checkout(driver)
+    flow.fork(driver, "checkout step one")
     checkout = CheckoutPage(driver)
 
     # Fill checkout information
@@ -46,9 +33,9 @@ def test_checkout_valid_information(driver):
 
 
 # TC03 – Empty First Name
-def test_checkout_empty_first_name(driver):
+def test_checkout_empty_first_name(driver, flow):
     """Test: Error when first name is empty"""
-    navigate_to_checkout(driver)
+    flow.fork(driver, "checkout step one")
     checkout = CheckoutPage(driver)
 
     # Try to continue without first name
@@ -60,9 +47,9 @@ def test_checkout_empty_first_name(driver):
 
 
 # TC04 – Empty Last Name
-def test_checkout_empty_last_name(driver):
+def test_checkout_empty_last_name(driver, flow):
     """Test: Error when last name is empty"""
-    navigate_to_checkout(driver)
+    flow.fork(driver, "checkout step one")
     checkout = CheckoutPage(driver)
 
     # Try to continue without last name
@@ -74,9 +61,9 @@ def test_checkout_empty_last_name(driver):
 
 
 # TC05 – Empty Postal Code
-def test_checkout_empty_postal_code(driver):
+def test_checkout_empty_postal_code(driver, flow):
     """Test: Error when postal code is empty"""
-    navigate_to_checkout(driver)
+    flow.fork(driver, "checkout step one")
     checkout = CheckoutPage(driver)
 
     # Try to continue without postal code
@@ -88,9 +75,10 @@ def test_checkout_empty_postal_code(driver):
 
 
 # TC06 – Cancel checkout from Step One
-def test_cancel_checkout_from_info_page(driver):
+@pytest.mark.ui_edges("step_one->cart")
+def test_cancel_checkout_from_info_page(driver, flow):
     """Test: Cancel button returns to cart"""
-    navigate_to_checkout(driver)
+    flow.fork(driver, "checkout step one")
     checkout = CheckoutPage(driver)
 
     # Verify we're on step one
@@ -105,6 +93,7 @@ def test_cancel_checkout_from_info_page(driver):
 
 
 # TC07 – Complete Full Checkout Flow (Main Test Case)
+@pytest.mark.ui_edges()
 def test_complete_full_checkout_flow(driver):
     """
     Test: Complete end-to-end checkout process
@@ -144,29 +133,28 @@ def test_complete_full_checkout_flow(driver):
 
 
 # TC08 – Verify Checkout Overview Details
-def test_checkout_overview_details(driver):
+def test_checkout_overview_details(flow):
     """Test: Verify product details on checkout overview page"""
-    navigate_to_checkout(driver)
+    driver = flow.view("checkout step two")
     checkout = CheckoutPage(driver)
 
-    # Fill info and go to step two
-    checkout.fill_checkout_info("Test", "User", "12345")
+    # Starts on step two (overview)
     assert checkout.is_on_step_two()
 
     # Verify 2 items are shown in overview
-    from selenium.webdriver.common.by import By
-    items = driver.find_elements(By.CLASS_NAME, "cart_item")
-    assert len(items) == 2
+    overview = checkout.get_overview()
+    assert overview["count"] == 2
+    assert len(overview["names"]) == 2
 
 
 # TC09 – Back Home after order completion
-def test_back_home_after_checkout(driver):
+@pytest.mark.ui_edges("step_two->complete", "complete->inventory")
+def test_back_home_after_checkout(driver, flow):
     """Test: Back home button returns to inventory"""
-    navigate_to_checkout(driver)
+    flow.fork(driver, "checkout step two")
     checkout = CheckoutPage(driver)
 
-    # Complete checkout
-    checkout.fill_checkout_info("Test", "User", "12345")
+    # Starts on step two (overview)
     assert checkout.is_on_step_two()
 
     checkout.click_finish()
@@ -180,13 +168,13 @@ def test_back_home_after_checkout(driver):
 
 
 # TC10 – Cancel from Step Two (Overview)
-def test_cancel_checkout_from_overview(driver):
+@pytest.mark.ui_edges("step_two->inventory")
+def test_cancel_checkout_from_overview(driver, flow):
     """Test: Cancel button on overview page returns to inventory"""
-    navigate_to_checkout(driver)
+    flow.fork(driver, "checkout step two")
     checkout = CheckoutPage(driver)
 
-    # Get to step two
-    checkout.fill_checkout_info("Test", "User", "12345")
+    # Starts on step two (overview)
     assert checkout.is_on_step_two()
 
     # Click cancel from overview
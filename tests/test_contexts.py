@@ -0,0 +1,25 @@
+from pages.login_page import LoginPage
+from pages.products_page import PRODUCT_IDS, ProductsPage
+from utils.config import app_url
+
+
+# TC01 – Verify browser contexts of one Chrome keep their sessions and elements apart
+
+def test_contexts_are_isolated(context_host, context_driver):
+    LoginPage(context_driver).login_fast("standard_user")
+    products = ProductsPage(context_driver)
+    # Read the listing (and its buttons) while this context's tab is current
+    assert sorted(products.catalog.names()) == sorted(PRODUCT_IDS)
+
+    other = context_host.new_context(app_url())
+    try:
+        # The other context shares no cookies: it is still on the login form
+        assert LoginPage(other).is_present(LoginPage.LOGIN_BTN)
+
+        # The session's current tab is now the other context's; the catalog's
+        # buttons must still be clicked in the tab they were found in
+        products.add_to_cart("Sauce Labs Onesie")
+        assert products.get_cart_count() == "1"
+        assert not ProductsPage(other).is_present(ProductsPage.CART_BADGE)
+    finally:
+        context_host.close_context(other.target_id)
@@ -5,6 +5,7 @@ from pages.checkout_page import CheckoutPage
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from utils.paths import screenshot_path
 import time
 
 
@@ -73,6 +74,7 @@ def test_debug_checkout_flow(driver):
     print(f"14. Is on step two: {checkout.is_on_step_two()}")
 
     # Take screenshot
-    driver.save_screenshot("screenshots/debug_test.png")
-    print("15. Screenshot saved to screenshots/debug_test.png")
+    path = screenshot_path("debug_test")
+    driver.save_screenshot(path)
+    print(f"15. Screenshot saved to {path}")
 
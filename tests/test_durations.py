@@ -0,0 +1,94 @@
+from collections import namedtuple
+
+import pytest
+
+from utils import durations
+from utils.durations import longest_first, within_budget
+
+# Stand-in for a collected pytest item: the scheduling only looks at node ids
+Item = namedtuple("Item", "nodeid")
+
+HISTORY = {
+    "slow": durations.TestStats(seconds=30.0, failure_rate=0.0, runs=10),
+    "medium": durations.TestStats(seconds=10.0, failure_rate=0.0, runs=10),
+    "fast": durations.TestStats(seconds=2.0, failure_rate=0.0, runs=10),
+    "failing": durations.TestStats(seconds=5.0, failure_rate=0.5, runs=10),
+}
+
+
+def ids(items):
+    return [item.nodeid for item in items]
+
+
+# TC01 – Verify tests are ordered slowest first, new tests as average-length (no browser)
+
+def test_longest_first():
+    items = [Item("fast"), Item("new"), Item("slow"), Item("medium")]
+    longest_first(items, HISTORY)
+
+    # "new" has no history and counts as the average of the known ones (11.75s)
+    assert ids(items) == ["slow", "new", "medium", "fast"]
+
+
+# TC02 – Verify recently failing tests go first with failing_first
+
+def test_failing_first():
+    items = [Item("fast"), Item("slow"), Item("failing")]
+
+    longest_first(items, HISTORY)
+    assert ids(items) == ["slow", "failing", "fast"]
+
+    longest_first(items, HISTORY, failing_first=True)
+    assert ids(items) == ["failing", "slow", "fast"]
+
+
+# TC03 – Verify a module's tests stay together, slowest module first
+
+def test_longest_first_keeps_modules_together():
+    history = {
+        "test_a.py::one": durations.TestStats(seconds=20.0, failure_rate=0.0, runs=10),
+        "test_a.py::two": durations.TestStats(seconds=1.0, failure_rate=0.0, runs=10),
+        "test_b.py::one": durations.TestStats(seconds=8.0, failure_rate=0.0, runs=10),
+        "test_b.py::two": durations.TestStats(seconds=9.0, failure_rate=0.0, runs=10),
+        "test_b.py::three": durations.TestStats(seconds=7.0, failure_rate=1.0, runs=10),
+    }
+    items = [Item(nodeid) for nodeid in ["test_a.py::two", "test_b.py::one", "test_a.py::one",
+                                         "test_b.py::three", "test_b.py::two"]]
+
+    # test_b.py takes 24s in total, test_a.py 21s
+    longest_first(items, history)
+    assert ids(items) == ["test_b.py::two", "test_b.py::one", "test_b.py::three",
+                          "test_a.py::one", "test_a.py::two"]
+
+    history["test_b.py::three"] = durations.TestStats(seconds=1.0, failure_rate=1.0, runs=10)
+    longest_first(items, history, failing_first=True)
+    assert ids(items) == ["test_b.py::three", "test_b.py::two", "test_b.py::one",
+                          "test_a.py::one", "test_a.py::two"]
+
+
+# TC04 – Verify the time budget keeps the most valuable tests and their collection order
+
+@pytest.mark.parametrize("seconds, workers, expected", [
+    # Unknown first, then failures, then value per second
+    (25, 1, ["fast", "failing", "new"]),
+    (17, 1, ["failing", "new"]),
+    # Two workers share the load: twice the capacity
+    (25, 2, ["medium", "fast", "failing", "new"]),
+    (100, 1, ["slow", "medium", "fast", "failing", "new"]),
+])
+def test_within_budget(seconds, workers, expected):
+    items = [Item("slow"), Item("medium"), Item("fast"), Item("failing"), Item("new")]
+    selected, deselected, estimate = within_budget(items, HISTORY, seconds, workers)
+
+    assert ids(selected) == expected
+    assert sorted(ids(selected) + ids(deselected)) == sorted(ids(items))
+    assert estimate <= seconds
+
+
+def test_within_budget_without_history():
+    items = [Item("a"), Item("b")]
+    selected, deselected, estimate = within_budget(items, {}, 60)
+
+    assert ids(selected) == ["a", "b"]
+    assert not deselected
+    assert estimate == 0
@@ -0,0 +1,71 @@
+import pytest
+
+from utils.flaky import MIN_ATTEMPTS, is_quarantined, score
+
+pytest_plugins = ["pytester"]
+
+
+# TC01 – Verify the flip-rate score of attempt histories (no browser)
+
+@pytest.mark.parametrize("attempts, expected", [
+    ([], 0.0),
+    (["fail"], 0.0),
+    (["fail", "pass"], 1.0),
+    (["pass", "fail", "pass", "fail"], 1.0),
+    (["fail"] * 6, 0.0),
+    (["pass"] * 6, 0.0),
+    (["pass", "pass", "fail", "fail", "pass"], 0.5),
+])
+def test_flip_rate_score(attempts, expected):
+    assert score(attempts) == expected
+
+
+# TC02 – Verify only tests that flip often enough, with enough history, are quarantined
+
+def test_quarantine_needs_history_and_flips():
+    flipping = ["pass", "fail"] * MIN_ATTEMPTS
+
+    assert is_quarantined(flipping)
+    assert not is_quarantined(flipping[:MIN_ATTEMPTS - 1])
+    assert not is_quarantined(["fail"] * (MIN_ATTEMPTS * 2))
+    assert not is_quarantined(["pass"] * (MIN_ATTEMPTS * 2 - 1) + ["fail"])
+
+
+# TC03 – Verify a test that passes first time tears its module down before the next module
+
+def test_retries_tear_down_between_modules(pytester):
+    pytester.makeconftest("""
+        from utils.flaky import FlakyPlugin
+
+        def pytest_configure(config):
+            config.pluginmanager.register(FlakyPlugin(config, retries=1), "flaky")
+    """)
+    pytester.makepyfile(
+        test_first="""
+            import pytest
+
+            events = []
+
+            @pytest.fixture(scope="module")
+            def module_browser():
+                events.append("setup")
+                yield
+                events.append("teardown")
+
+            def test_one(module_browser):
+                pass
+
+            def test_two(module_browser):
+                assert events == ["setup"]
+        """,
+        test_second="""
+            from test_first import events
+
+            def test_three():
+                assert events == ["setup", "teardown"]
+        """,
+    )
+    result = pytester.runpytest("-p", "no:cacheprovider")
+
+    result.assert_outcomes(passed=3)
+    assert "rerun" not in result.stdout.str().lower()
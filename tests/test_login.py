@@ -1,8 +1,14 @@
+import pytest
+
+from pages.base_page import url_contains
 from pages.login_page import LoginPage
+from pages.products_page import ProductsPage
+from utils.data_tables import as_params, load_table
 
 
-# Valid Login
+# Valid Login, typed key by key
 
+@pytest.mark.real_typing
 def test_login_valid_credentials(driver):
     login = LoginPage(driver)
     login.login("standard_user", "secret_sauce")
@@ -10,61 +16,29 @@ def test_login_valid_credentials(driver):
     assert "inventory" in driver.current_url
 
 
-# Valid Username + Invalid Password
-
-def test_login_valid_username_invalid_password(driver):
-    login = LoginPage(driver)
-    login.login("standard_user", "wrong_password")
-
-    assert login.is_error_displayed()
-    assert "Epic sadface" in login.get_error_message()
-
-
-# Invalid Username + Valid Password
+# Every row of tests/data/login_cases.csv, all in one browser
 
-def test_login_invalid_username_valid_password(driver):
-    login = LoginPage(driver)
-    login.login("invalid_user", "secret_sauce")
-
-    assert login.is_error_displayed()
-    assert "Epic sadface" in login.get_error_message()
-
-
-# Invalid Username + Invalid Password
-
-def test_login_invalid_username_invalid_password(driver):
-    login = LoginPage(driver)
-    login.login("invalid_user", "wrong_password")
+@pytest.mark.parametrize("case", as_params(load_table("login_cases.csv")))
+def test_login_matrix(login_form, case):
+    login_form.login(case["username"], case["password"])
 
-    assert login.is_error_displayed()
-    assert "Epic sadface" in login.get_error_message()
+    if case["expected"] == "inventory":
+        login_form.wait_until(url_contains("inventory"), profile="navigation")
+    else:
+        assert login_form.is_error_displayed()
+        assert case["message"] in login_form.get_error_message()
+        assert "inventory" not in login_form.driver.current_url
 
 
-# Empty Username + Empty Password
+# Fast login as another user, and again after a logout
 
-def test_login_empty_credentials(driver):
+def test_login_fast_switches_user(driver):
     login = LoginPage(driver)
-    login.click_login()
-
-    assert login.is_error_displayed()
-    assert "Epic sadface" in login.get_error_message()
-
-
-# Empty Username + Valid Password
-
-def test_login_empty_username(driver):
-    login = LoginPage(driver)
-    login.login("", "secret_sauce")
-
-    assert login.is_error_displayed()
-    assert "Epic sadface" in login.get_error_message()
-
-
-# Valid Username + Empty Password
-
-def test_login_empty_password(driver):
-    login = LoginPage(driver)
-    login.login("standard_user", "")
-
-    assert login.is_error_displayed()
-    assert "Epic sadface" in login.get_error_message()
\ No newline at end of file
+    login.login_fast("standard_user")
+    login.login_fast("problem_user")
+    assert login.session_user() == "problem_user"
+
+    ProductsPage(driver).logout()
+    login.login_fast("standard_user", landing="cart.html")
+    assert login.session_user() == "standard_user"
+    assert "cart" in driver.current_url
@@ -1,10 +1,18 @@
+import pytest
+
 from pages.login_page import LoginPage
 from pages.products_page import ProductsPage
 from pages.cart_page import CartPage
 from pages.checkout_page import CheckoutPage
 
 
-def test_positive_purchase_flow(driver):
+# Every page object through the real UI, once on each backend
+@pytest.mark.ui_edges()
+@pytest.mark.parametrize("backend", [
+    pytest.param("webdriver", marks=pytest.mark.backend("webdriver")),
+    pytest.param("cdp", marks=pytest.mark.backend("cdp")),
+])
+def test_positive_purchase_flow(driver, backend):
     login = LoginPage(driver)
     login.login("standard_user", "secret_sauce")
 
@@ -0,0 +1,93 @@
+import pytest
+
+from pages.base_page import dom_mutated, dom_settled, network_idle
+from pages.cart_page import CartPage
+from pages.products_page import PRODUCT_IDS, ProductsPage
+
+
+# TC01 – Verify every sort order of the inventory
+
+@pytest.mark.parametrize("order, key, reverse", [
+    ("az", "name", False),
+    ("za", "name", True),
+    ("lohi", "price", False),
+    ("hilo", "price", True),
+])
+def test_inventory_sort_order(logged_in_driver, order, key, reverse):
+    products = ProductsPage(logged_in_driver)
+    products.sort_by(order)
+
+    assert products.catalog.is_sorted(key, reverse)
+
+
+# TC02 – Verify products can be added by name and removed by id
+
+def test_add_and_remove_by_name_and_id(logged_in_driver):
+    products = ProductsPage(logged_in_driver)
+    products.add_to_cart("Sauce Labs Onesie", "Sauce Labs Fleece Jacket")
+
+    assert products.get_cart_count() == "2"
+    assert {p.name for p in products.catalog.in_cart()} == {"Sauce Labs Onesie", "Sauce Labs Fleece Jacket"}
+
+    products.remove_from_cart(PRODUCT_IDS["Sauce Labs Onesie"])
+
+    assert products.get_cart_count() == "1"
+
+
+# TC03 – Verify the catalog lists every known product
+
+def test_catalog_lists_all_products(logged_in_driver):
+    catalog = ProductsPage(logged_in_driver).catalog
+
+    assert sorted(catalog.names()) == sorted(PRODUCT_IDS)
+    assert all(catalog.get(name).id == product_id for name, product_id in PRODUCT_IDS.items())
+
+
+# TC04 – Verify product images load when the test opts out of the lean profile
+
+@pytest.mark.full_browser
+def test_product_images_load_in_full_browser(logged_in_driver):
+    images = ProductsPage(logged_in_driver).get_image_status()
+
+    assert sorted(images) == sorted(PRODUCT_IDS)
+    assert all(images.values())
+
+
+# TC05 – Verify the lean profile blocks product images
+
+def test_product_images_blocked_in_lean_browser(request, logged_in_driver):
+    if request.config.getoption("--no-lean-browser"):
+        pytest.skip("lean profile is off for this run")
+    images = ProductsPage(logged_in_driver).get_image_status()
+
+    assert sorted(images) == sorted(PRODUCT_IDS)
+    assert not any(images.values())
+
+
+# TC06 – Verify the DOM and network waits follow a re-render of the listing
+
+def test_dom_and_network_waits(logged_in_driver):
+    products = ProductsPage(logged_in_driver)
+    since = products.watch_dom()
+
+    products.add_to_cart("Sauce Labs Onesie")
+    products.wait_until(dom_mutated(since), profile="element")
+    assert products.watch_dom() > since
+
+    products.wait_until(dom_settled(), profile="element")
+    assert products.wait_until(network_idle(), profile="navigation")
+
+
+# TC07 – Verify the catalog is read again after the cart changed on another page
+
+def test_catalog_follows_cart_changes(logged_in_driver):
+    products = ProductsPage(logged_in_driver)
+    products.add_to_cart("Sauce Labs Onesie")
+    assert [product.name for product in products.catalog.in_cart()] == ["Sauce Labs Onesie"]
+
+    products.go_to_cart()
+    cart = CartPage(logged_in_driver)
+    cart.remove_first_item()
+    cart.click_continue_shopping()
+
+    assert products.catalog.in_cart() == []
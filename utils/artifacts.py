@@ -0,0 +1,150 @@
+"""
+Failure artifacts (screenshot, DOM, browser console) captured off the critical path.
+
+The browser is only asked for raw data - the screenshot as the base64 string
+WebDriver already sends, the page source, the console log - so the teardown
+that captures them is just three commands. Decoding, gzipping and writing
+happen on a small thread pool. Files are named after the SHA-256 of their
+content, so the same screenshot from a retry or another parametrization is
+stored once, and the store keeps itself under a disk budget by evicting the
+oldest files first.
+"""
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.common.exceptions import WebDriverException
+
+from utils.paths import ARTIFACTS_DIR, artifact_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_MB = 200
+
+
+def _digest(data):
+    if isinstance(data, str):
+        data = data.encode()
+    return hashlib.sha256(data).hexdigest()[:20]
+
+
+def _decode_png(data):
+    return base64.b64decode(data)
+
+
+def _gzip_text(data):
+    return gzip.compress(data.encode(), compresslevel=6)
+
+
+class ArtifactStore:
+    """
+    Content-addressed directory of failure artifacts with a size budget.
+
+    Args:
+        root: directory to write to (per xdist worker by default)
+        budget_bytes: total size the directory may grow to before old files are evicted
+        workers: encoder threads
+    """
+
+    def __init__(self, root=None, budget_bytes=DEFAULT_BUDGET_MB * 2**20, workers=2):
+        self.root = root or artifact_dir(ARTIFACTS_DIR)
+        self.budget_bytes = budget_bytes
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="artifacts")
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._futures = []
+        self.stored = 0
+        self.deduplicated = 0
+        self.evicted = 0
+
+    def capture(self, driver):
+        """
+        Grab screenshot, DOM and console log from ``driver`` and queue them for
+        writing. Returns {kind: path}; the paths are final even though the
+        files may not exist yet.
+        """
+        raw = {}
+        try:
+            raw["screenshot"] = (driver.get_screenshot_as_base64(), ".png", _decode_png)
+            raw["dom"] = (driver.page_source, ".html.gz", _gzip_text)
+        except WebDriverException as error:
+            logger.warning("Could not capture failure artifacts: %s", error)
+        try:
+            console = "\n".join(json.dumps(entry) for entry in driver.get_log("browser"))
+            raw["console"] = (console, ".log.gz", _gzip_text)
+        except (WebDriverException, AttributeError):
+            # Console logs need goog:loggingPrefs (set by create_driver) and a Chromium browser
+            pass
+
+        return {kind: self.add(data, suffix, encode) for kind, (data, suffix, encode) in raw.items()}
+
+    def add(self, data, suffix, encode):
+        """Queue ``encode(data)`` for writing under its content hash and return the path"""
+        path = os.path.join(self.root, _digest(data) + suffix)
+        with self._lock:
+            if path in self._pending or os.path.exists(path):
+                self.deduplicated += 1
+                if os.path.exists(path):
+                    # Recently seen again, so it's the last thing eviction should take
+                    os.utime(path)
+                return path
+            future = self._executor.submit(self._write, path, data, encode)
+            self._pending[path] = future
+            self._futures.append(future)
+        return path
+
+    def _write(self, path, data, encode):
+        try:
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(encode(data))
+            os.replace(tmp, path)
+            self.stored += 1
+        except Exception:
+            logger.exception("Could not write artifact %s", path)
+        finally:
+            with self._lock:
+                self._pending.pop(path, None)
+        self._enforce_budget()
+
+    def _enforce_budget(self):
+        with self._lock:
+            files = []
+            # The shared root also holds the per-worker sub-directories under xdist: files only
+            with os.scandir(self.root) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".tmp"):
+                        continue
+                    try:
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.budget_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError as error:
+                    # Gone already or not ours to delete: keep evicting the next oldest
+                    logger.warning("Could not evict artifact %s: %s", path, error)
+                    continue
+                total -= size
+                self.evicted += 1
+
+    def close(self):
+        """Wait for queued artifacts to be written and log anything that failed in the background"""
+        self._executor.shutdown(wait=True)
+        for future in self._futures:
+            if future.exception() is not None:
+                logger.error("Artifact writer failed", exc_info=future.exception())
+        self._futures.clear()
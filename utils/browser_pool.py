@@ -0,0 +1,117 @@
+from selenium.common.exceptions import WebDriverException
+
+from utils import lean_profile
+from utils.config import app_url
+from utils.driver_factory import create_driver, quit_driver
+
+
+class BrowserPool:
+    """
+    Keeps warm browsers around so tests don't pay Chrome startup every time.
+
+    A pool lives for the whole session (one per xdist worker, since every
+    worker is its own process). Tests lease a driver and hand it back;
+    on release the browser is reset to a clean, logged-out login page.
+    Browsers that fail the health check or have served ``max_uses`` tests
+    are quit and replaced on the next lease. ``close`` quits every browser the
+    pool launched, including leases that were never handed back.
+    """
+
+    def __init__(self, factory=create_driver, max_uses=50, start_url=None, lean=True):
+        self.factory = factory
+        # Default lean profile (utils/lean_profile.py); single leases can ask for a full browser
+        self.lean = lean
+        self.max_uses = max_uses
+        # Login page of the configured application unless told otherwise
+        self.start_url = start_url or app_url()
+        self._idle = []
+        # Leased browsers by id, so a lease whose fixture died before release still gets quit
+        self._leased = {}
+        self._uses = {}
+        self.launched = 0
+        self.recycled = 0
+
+    def acquire(self, lean=None):
+        """Lease a browser parked on the start URL, with the lean profile on or off"""
+        lean = self.lean if lean is None else lean
+
+        if self._idle:
+            driver = self._idle.pop()
+            if (getattr(driver, "lean_profile", None) is not None) != lean:
+                # Reload so the start page itself matches the requested profile
+                lean_profile.apply(driver, lean)
+                driver.get(self.start_url)
+            self._leased[id(driver)] = driver
+            return driver
+
+        driver = self.factory(lean=self.lean)
+        self.launched += 1
+        self._uses[id(driver)] = 0
+        self._leased[id(driver)] = driver
+        try:
+            lean_profile.apply(driver, lean)
+            driver.get(self.start_url)
+        except WebDriverException:
+            self.discard(driver)
+            raise
+        return driver
+
+    def release(self, driver):
+        """Return a leased browser, resetting or recycling it"""
+        self._leased.pop(id(driver), None)
+        self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+
+        if self._uses[id(driver)] >= self.max_uses or not self.is_healthy(driver):
+            self.discard(driver)
+            return
+
+        try:
+            self.reset(driver)
+        except WebDriverException:
+            self.discard(driver)
+            return
+
+        self._idle.append(driver)
+
+    def reset(self, driver):
+        """Clear cookies and storage, then go back to the login page"""
+        # Storage is per origin, so clear it before leaving the app's pages
+        if driver.current_url.startswith(self.start_url):
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        driver.delete_all_cookies()
+        # Undo any implicit wait a test may have set so it can't leak into the next lease
+        driver.implicitly_wait(0)
+        driver.get(self.start_url)
+
+    def is_healthy(self, driver):
+        try:
+            handles = driver.window_handles
+            if len(handles) != 1:
+                # Tests that opened extra tabs/windows leave the browser in a state
+                # we don't want to reason about - start over with a fresh one
+                return False
+            driver.switch_to.window(handles[0])
+            return driver.execute_script("return document.readyState") is not None
+        except WebDriverException:
+            return False
+
+    def discard(self, driver):
+        self._leased.pop(id(driver), None)
+        self._uses.pop(id(driver), None)
+        self.recycled += 1
+        try:
+            quit_driver(driver)
+        except WebDriverException:
+            pass
+
+    def close(self):
+        """Quit every browser at the end of the session, idle or still leased"""
+        drivers = self._idle + list(self._leased.values())
+        self._idle = []
+        self._leased = {}
+        for driver in drivers:
+            self._uses.pop(id(driver), None)
+            try:
+                quit_driver(driver)
+            except WebDriverException:
+                pass
@@ -0,0 +1,97 @@
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+
+def capture_cookies(driver):
+    """Return the current page's cookies as plain dicts"""
+    return driver.get_cookies()
+
+
+def cookies_expired(cookies):
+    now = time.time()
+    return any("expiry" in cookie and cookie["expiry"] <= now for cookie in cookies)
+
+
+def inject_cookies(driver, cookies, url):
+    """
+    Put cookies into the browser without visiting ``url`` first.
+
+    Chrome's DevTools ``Network.setCookie`` accepts a target URL, so the
+    cookies are in place before the first ``driver.get``. Other drivers
+    fall back to ``add_cookie``, which only works while the browser is
+    already on the cookies' domain.
+    """
+    if hasattr(driver, "execute_cdp_cmd"):
+        try:
+            for cookie in cookies:
+                driver.execute_cdp_cmd("Network.setCookie", to_cdp_cookie(cookie, url))
+            return
+        except WebDriverException:
+            pass
+
+    for cookie in cookies:
+        driver.add_cookie(cookie)
+
+
+def to_cdp_cookie(cookie, url):
+    """Selenium cookie dict -> DevTools Network.setCookie params"""
+    params = {
+        "name": cookie["name"],
+        "value": cookie["value"],
+        "url": url,
+        "path": cookie.get("path", "/"),
+        "secure": cookie.get("secure", False),
+        "httpOnly": cookie.get("httpOnly", False),
+    }
+    if "expiry" in cookie:
+        params["expires"] = cookie["expiry"]
+    if cookie.get("sameSite"):
+        params["sameSite"] = cookie["sameSite"]
+    return params
+
+
+STORAGE_CAPTURE_SCRIPT = """
+const dump = storage => {
+    const values = {};
+    for (let i = 0; i < storage.length; i++) {
+        values[storage.key(i)] = storage.getItem(storage.key(i));
+    }
+    return values;
+};
+return [dump(window.localStorage), dump(window.sessionStorage)];
+"""
+
+STORAGE_RESTORE_SCRIPT = """
+const load = (storage, values) => {
+    storage.clear();
+    for (const key of Object.keys(values)) {
+        storage.setItem(key, values[key]);
+    }
+};
+load(window.localStorage, arguments[0]);
+load(window.sessionStorage, arguments[1]);
+"""
+
+
+def capture_state(driver):
+    """URL, cookies and web storage of the current page"""
+    local, session = driver.execute_script(STORAGE_CAPTURE_SCRIPT)
+    return {
+        "url": driver.current_url,
+        "cookies": capture_cookies(driver),
+        "local_storage": local,
+        "session_storage": session,
+    }
+
+
+def restore_state(driver, state):
+    """
+    Put a captured state back and open its URL.
+    The browser must already be on a page of the same origin (e.g. the login
+    page a pooled browser is parked on) so the storage is writable.
+    """
+    driver.delete_all_cookies()
+    inject_cookies(driver, state["cookies"], state["url"])
+    driver.execute_script(STORAGE_RESTORE_SCRIPT, state["local_storage"], state["session_storage"])
+    driver.get(state["url"])
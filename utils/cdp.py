@@ -0,0 +1,200 @@
+import base64
+import json
+import os
+import socket
+import struct
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import TimeoutException
+
+_OP_TEXT = 0x1
+_OP_CLOSE = 0x8
+_OP_PING = 0x9
+_OP_PONG = 0xA
+
+
+class CdpError(Exception):
+    """A DevTools command failed or the connection broke"""
+
+
+class CdpConnection:
+    """
+    One persistent Chrome DevTools Protocol websocket.
+
+    Only what the page-object backend needs: send commands (several at once
+    without waiting in between), collect their responses, and block until a
+    given event arrives. Uses a bare socket so there's no extra dependency.
+    """
+
+    def __init__(self, ws_url, timeout=30):
+        parsed = urlparse(ws_url)
+        self.timeout = timeout
+        self._sock = socket.create_connection((parsed.hostname, parsed.port), timeout=timeout)
+        self._buffer = b""
+        self._next_id = 0
+        self._responses = {}
+        # Page.enable makes Chrome chatty; only the recent events are ever interesting
+        self._events = deque(maxlen=1000)
+        self._handshake(parsed)
+
+    def _handshake(self, parsed):
+        key = base64.b64encode(os.urandom(16)).decode()
+        request = (
+            f"GET {parsed.path or '/'} HTTP/1.1\r\n"
+            f"Host: {parsed.hostname}:{parsed.port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        )
+        self._sock.sendall(request.encode())
+
+        while b"\r\n\r\n" not in self._buffer:
+            self._fill()
+        head, self._buffer = self._buffer.split(b"\r\n\r\n", 1)
+        status = head.split(b"\r\n", 1)[0].decode()
+        if " 101 " not in status + " ":
+            raise CdpError(f"DevTools websocket handshake failed: {status}")
+
+    def call(self, method, params=None, session_id=None):
+        return self.send_many([(method, params)], session_id)[0]
+
+    def send_many(self, commands, session_id=None):
+        """
+        Pipeline several (method, params) commands: all are written before any
+        response is read, so N commands cost one round-trip instead of N.
+        Returns their results in order.
+        """
+        ids = []
+        for method, params in commands:
+            self._next_id += 1
+            message = {"id": self._next_id, "method": method, "params": params or {}}
+            if session_id:
+                message["sessionId"] = session_id
+            self._send_frame(json.dumps(message).encode())
+            ids.append(self._next_id)
+        return [self._result(command_id) for command_id in ids]
+
+    def _result(self, command_id):
+        deadline = time.monotonic() + self.timeout
+        while command_id not in self._responses:
+            self._dispatch(self._recv_message(deadline))
+        message = self._responses.pop(command_id)
+        if "error" in message:
+            raise CdpError(message["error"].get("message", str(message["error"])))
+        return message.get("result", {})
+
+    def clear_events(self, method):
+        for event in [e for e in self._events if e.get("method") == method]:
+            self._events.remove(event)
+
+    def wait_for_event(self, method, session_id=None, timeout=10):
+        """Block until ``method`` fires (for ``session_id``) and return its params"""
+        deadline = time.monotonic() + timeout
+        while True:
+            for event in self._events:
+                if event.get("method") == method and event.get("sessionId") == session_id:
+                    self._events.remove(event)
+                    return event.get("params", {})
+            self._dispatch(self._recv_message(deadline))
+
+    def wait_for_any(self, methods, session_id=None, timeout=10):
+        """
+        Block until any of ``methods`` fires (for ``session_id``) or ``timeout`` passes.
+        Consumes every matching event already received; returns whether there was one.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            matched = [e for e in self._events if e.get("method") in methods and e.get("sessionId") == session_id]
+            if matched:
+                for event in matched:
+                    self._events.remove(event)
+                return True
+            try:
+                self._dispatch(self._recv_message(deadline))
+            except TimeoutException:
+                return False
+
+    def _dispatch(self, message):
+        if "id" in message:
+            self._responses[message["id"]] = message
+        else:
+            self._events.append(message)
+
+    def _send_frame(self, payload, opcode=_OP_TEXT):
+        header = bytearray([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header.append(0x80 | length)
+        elif length < 65536:
+            header.append(0x80 | 126)
+            header += struct.pack("!H", length)
+        else:
+            header.append(0x80 | 127)
+            header += struct.pack("!Q", length)
+
+        # Client frames must be masked (RFC 6455 section 5.3)
+        mask = os.urandom(4)
+        header += mask
+        repeated = (mask * (length // 4 + 1))[:length]
+        masked = (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(length, "big")
+        self._sock.sendall(bytes(header) + masked)
+
+    def _recv_message(self, deadline):
+        chunks = []
+        while True:
+            # Once a message has started it is read to the end: giving up halfway
+            # would leave the rest of it in the buffer as a bogus frame header
+            first, second = self._read(2, max(deadline, time.monotonic() + self.timeout) if chunks else deadline)
+            frame_deadline = max(deadline, time.monotonic() + self.timeout)
+            opcode = first & 0x0F
+            length = second & 0x7F
+            if length == 126:
+                length = struct.unpack("!H", self._read(2, frame_deadline))[0]
+            elif length == 127:
+                length = struct.unpack("!Q", self._read(8, frame_deadline))[0]
+            mask = self._read(4, frame_deadline) if second & 0x80 else None
+            data = self._read(length, frame_deadline)
+            if mask:
+                data = bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+
+            if opcode == _OP_CLOSE:
+                raise CdpError("DevTools websocket closed by the browser")
+            if opcode == _OP_PING:
+                self._send_frame(data, _OP_PONG)
+                continue
+            if opcode == _OP_PONG:
+                continue
+
+            chunks.append(data)
+            if first & 0x80:
+                return json.loads(b"".join(chunks))
+
+    def _read(self, count, deadline):
+        while len(self._buffer) < count:
+            self._fill(deadline)
+        data, self._buffer = self._buffer[:count], self._buffer[count:]
+        return data
+
+    def _fill(self, deadline=None):
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException("Timed out waiting for a DevTools message")
+            self._sock.settimeout(remaining)
+        try:
+            chunk = self._sock.recv(65536)
+        except socket.timeout:
+            raise TimeoutException("Timed out waiting for a DevTools message") from None
+        if not chunk:
+            raise CdpError("DevTools websocket connection lost")
+        self._buffer += chunk
+
+    def close(self):
+        try:
+            self._send_frame(b"", _OP_CLOSE)
+        except OSError:
+            pass
+        self._sock.close()
@@ -0,0 +1,100 @@
+from pages.base_page import BasePage
+from pages.checkout_page import CheckoutPage
+from pages.login_page import LoginPage
+from pages.products_page import DEFAULT_CART
+from utils import impact
+from utils.browser_state import STORAGE_CAPTURE_SCRIPT, capture_state, restore_state
+
+
+def _cart_with_2_items(driver):
+    BasePage(driver).seed_cart(DEFAULT_CART)
+    LoginPage(driver).login_fast("standard_user", landing="cart.html")
+
+
+def _checkout_step_one(driver):
+    BasePage(driver).seed_cart(DEFAULT_CART)
+    LoginPage(driver).login_fast("standard_user", landing="checkout-step-one.html")
+
+
+def _checkout_step_two(driver):
+    _checkout_step_one(driver)
+    checkout = CheckoutPage(driver)
+    checkout.fill_checkout_info("Test", "User", "12345")
+    assert checkout.is_on_step_two(), "could not reach checkout step two"
+
+
+# Named points in the purchase flow, and how to get there from a fresh browser
+CHECKPOINTS = {
+    "cart with 2 items": _cart_with_2_items,
+    "checkout step one": _checkout_step_one,
+    "checkout step two": _checkout_step_two,
+}
+
+
+class FlowCheckpoints:
+    """
+    Reaches each named checkpoint once per test module and reuses it.
+
+    ``view(name)`` hands out one shared browser parked at the checkpoint, for
+    tests that only read the page. ``fork(driver, name)`` copies the
+    checkpoint's cookies and storage into the test's own freshly reset browser
+    and opens the checkpoint URL, for tests that click, type or navigate.
+    Either way a test starts from the checkpoint state, never from whatever
+    the previous test left behind.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self._states = {}
+        self._viewer = None
+        self._viewing = None
+        # Whether the shared browser is as the pool reset it; anything else
+        # (a checkpoint, a view, a test that dirtied it) means reset before reuse
+        self._viewer_clean = False
+
+    def state(self, name):
+        if name not in self._states:
+            driver = self._viewer_driver()
+            if not self._viewer_clean:
+                self.pool.reset(driver)
+            self._viewer_clean = False
+            # Built for the first test that asks, relied on by all of them (--record-impact)
+            with impact.shared(f"checkpoint {name}"):
+                CHECKPOINTS[name](driver)
+            self._states[name] = capture_state(driver)
+            self._viewing = name
+        impact.uses(f"checkpoint {name}")
+        return self._states[name]
+
+    def view(self, name):
+        state = self.state(name)
+        if self._viewing != name:
+            self.pool.reset(self._viewer)
+            restore_state(self._viewer, state)
+            self._viewing = name
+            self._viewer_clean = False
+        return self._viewer
+
+    def fork(self, driver, name):
+        restore_state(driver, self.state(name))
+        return driver
+
+    def check_untouched(self):
+        """Called after each test: if the shared browser was navigated or its storage changed, restore it"""
+        if self._viewing is None:
+            return
+        state = self._states[self._viewing]
+        local, session = self._viewer.execute_script(STORAGE_CAPTURE_SCRIPT)
+        if (self._viewer.current_url, local, session) != (state["url"], state["local_storage"], state["session_storage"]):
+            self._viewing = None
+
+    def _viewer_driver(self):
+        if self._viewer is None:
+            self._viewer = self.pool.acquire()
+            self._viewer_clean = True
+        return self._viewer
+
+    def close(self):
+        if self._viewer is not None:
+            self.pool.release(self._viewer)
+            self._viewer = None
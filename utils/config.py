@@ -0,0 +1,21 @@
+import os
+
+DEFAULT_BASE_URL = "https://www.saucedemo.com/"
+
+# Where the application under test lives. The SAUCEDEMO_URL environment variable
+# or the --app-url / --local-app pytest options change it for the whole run.
+_base_url = os.environ.get("SAUCEDEMO_URL", DEFAULT_BASE_URL)
+
+
+def get_base_url():
+    return _base_url
+
+
+def set_base_url(url):
+    global _base_url
+    _base_url = url if url.endswith("/") else url + "/"
+
+
+def app_url(path=""):
+    """Absolute URL of an application page, e.g. app_url("cart.html")"""
+    return _base_url + path.lstrip("/")
@@ -0,0 +1,171 @@
+"""
+Several isolated browsing contexts inside one Chrome process.
+
+A headless Chrome costs hundreds of MB, a browser context (an incognito-like
+profile with its own cookies, storage and cache) only a renderer. Each
+context gets a driver object of its own that page objects use exactly like a
+normal WebDriver; all of them share the one chromedriver session, which
+switches to the right tab before every command - including the commands of
+elements the context's driver found.
+"""
+import copy
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.webdriver.remote.command import Command
+
+from utils import lean_profile
+
+
+class BrowserContexts:
+    def __init__(self, driver):
+        self.driver = driver
+        self._execute = driver.execute
+        # chromedriver has one "current window" per session, so a switch and the
+        # command that follows it must not interleave with another thread's
+        self._lock = threading.RLock()
+        self._home = self._current = driver.current_window_handle
+        self._open = {}
+
+    def new_context(self, url="about:blank"):
+        """Create an isolated context with one tab and return a driver bound to it"""
+        with self._lock:
+            context_id = self.driver.execute_cdp_cmd(
+                "Target.createBrowserContext", {"disposeOnDetach": False}
+            )["browserContextId"]
+            target_id = self.driver.execute_cdp_cmd(
+                "Target.createTarget", {"url": url, "browserContextId": context_id}
+            )["targetId"]
+
+        view = copy.copy(self.driver)
+        # State that belongs to the original tab must not follow the copy
+        view.__dict__.pop("page_backend", None)
+        view.lean_profile = None
+        view.execute = self._bound_execute(view, target_id)
+        view.quit = lambda: self.close_context(target_id)
+        view.context_id = context_id
+        view.target_id = target_id
+        self._open[target_id] = context_id
+
+        if getattr(self.driver, "lean_profile", None) is not None:
+            lean_profile.apply(view, True)
+        return view
+
+    def _bound_execute(self, view, target_id):
+        # The class's execute run on the view, not the original driver's: responses are
+        # unwrapped by the view, so the WebElements in them belong to the view and
+        # their clicks, keys and reads come back through here and switch tabs too
+        run = functools.partial(type(self.driver).execute, view)
+
+        def execute(driver_command, params=None):
+            with self._lock:
+                if self._current != target_id:
+                    self._execute(Command.SWITCH_TO_WINDOW, {"handle": target_id})
+                    self._current = target_id
+                return run(driver_command, params)
+        return execute
+
+    def close_context(self, target_id):
+        with self._lock:
+            context_id = self._open.pop(target_id, None)
+            if context_id is None:
+                return
+            # Park the session back on the original tab before its current one disappears
+            self._execute(Command.SWITCH_TO_WINDOW, {"handle": self._home})
+            self._current = self._home
+            self.driver.execute_cdp_cmd("Target.closeTarget", {"targetId": target_id})
+            self.driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": context_id})
+
+    def close(self):
+        for target_id in list(self._open):
+            self.close_context(target_id)
+
+
+def browser_memory(driver):
+    """
+    Resident memory (bytes) of chromedriver's whole Chrome process tree, or None
+    where /proc is not available.
+    """
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    if process is None or not os.path.isdir("/proc"):
+        return None
+
+    children = {}
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                parent = int(f.read().rsplit(")", 1)[1].split()[1])
+            children.setdefault(parent, []).append(int(pid))
+        except (OSError, IndexError, ValueError):
+            continue
+
+    total = 0
+    pending = list(children.get(process.pid, []))
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total
+
+
+class ContextScheduler:
+    """
+    Runs tasks concurrently, ``concurrency`` at a time, each in its own fresh
+    browser context of one shared browser.
+
+    A task is a callable taking a driver. WebDriver commands are serialized by
+    the session, but everything between them - page loads settling, waits
+    polling, Python-side work - overlaps across contexts.
+    """
+
+    def __init__(self, driver, concurrency=4):
+        self.contexts = BrowserContexts(driver)
+        self.concurrency = concurrency
+        self.stats = {}
+
+    def run(self, tasks):
+        """Run all tasks; returns a list of (result, exception) in task order"""
+        baseline = browser_memory(self.contexts.driver)
+        peak = baseline or 0
+        started = time.monotonic()
+
+        def run_one(task):
+            nonlocal peak
+            view = self.contexts.new_context()
+            try:
+                return task(view), None
+            except Exception as error:
+                return None, error
+            finally:
+                memory = browser_memory(self.contexts.driver)
+                if memory:
+                    peak = max(peak, memory)
+                self.contexts.close_context(view.target_id)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            results = list(executor.map(run_one, tasks))
+
+        self.stats = {
+            "tasks": len(tasks),
+            "concurrency": self.concurrency,
+            "seconds": round(time.monotonic() - started, 3),
+            "browser_bytes": baseline,
+            "peak_bytes": peak or None,
+        }
+        if baseline and peak:
+            per_context = (peak - baseline) / min(self.concurrency, len(tasks) or 1)
+            self.stats["bytes_per_context"] = int(per_context)
+            # What one more test costs here vs. a browser of its own
+            self.stats["bytes_saved_per_test"] = int(baseline - per_context)
+        return results
@@ -0,0 +1,31 @@
+import csv
+import os
+
+import pytest
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "data")
+
+
+def load_table(name):
+    """
+    Rows of tests/data/<name> as a list of dicts.
+    CSV files use their header row as keys; YAML files (needs PyYAML) hold a list of mappings.
+    Empty CSV cells come back as "" so a row can ask for an empty field.
+    """
+    path = os.path.join(DATA_DIR, name)
+    if name.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError(f"PyYAML is needed to read {name} (pip install pyyaml)") from None
+        with open(path) as f:
+            rows = yaml.safe_load(f) or []
+        return [{key: "" if value is None else str(value) for key, value in row.items()} for row in rows]
+
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def as_params(rows, id_column="id"):
+    """One pytest.param per row, named after its ``id_column`` so each row reports as its own item"""
+    return [pytest.param(row, id=row[id_column]) for row in rows]
@@ -0,0 +1,82 @@
+import logging
+import os
+
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from utils import provisioning
+
+logger = logging.getLogger(__name__)
+
+# Chrome features a test browser never needs; they only cost startup time and background traffic
+LEAN_ARGUMENTS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-features=Translate,OptimizationHints,MediaRouter",
+    "--no-first-run",
+    "--mute-audio",
+]
+
+
+def build_chrome_options(lean=True):
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    # Keep the browser console so failure artifacts can include it
+    options.set_capability("goog:loggingPrefs", {"browser": "ALL"})
+    if lean:
+        for argument in LEAN_ARGUMENTS:
+            options.add_argument(argument)
+    return options
+
+
+def create_driver(lean=True, provisioned=True, profile=True):
+    """
+    Launch a new headless Chrome session.
+    Once ``python -m utils.provisioning`` has run, the pinned chromedriver/Chrome pair is
+    used (no Selenium Manager lookup) and the session starts from a clone of the warmed-up
+    profile template; if the pinned pair no longer starts, Selenium Manager resolves one.
+    ``provisioned``/``profile`` switch that off, e.g. for benchmarks.
+    """
+    options = build_chrome_options(lean)
+    manifest = provisioning.load_manifest() if provisioned else None
+
+    # No implicit wait: page objects use explicit waits only (see pages/wait_policy.py)
+    if manifest is None:
+        return webdriver.Chrome(options=options)
+
+    pinned = build_chrome_options(lean)
+    if manifest["chrome"]:
+        pinned.binary_location = manifest["chrome"]
+    clone = None
+    if profile and os.path.isdir(manifest["profile_template"]):
+        clone = provisioning.clone_profile(manifest["profile_template"])
+        pinned.add_argument(f"--user-data-dir={clone}")
+    try:
+        driver = webdriver.Chrome(service=Service(manifest["chromedriver"]), options=pinned)
+    except SessionNotCreatedException:
+        # Typically a browser update the manifest couldn't detect: let Selenium Manager find a match
+        logger.warning("Pinned chromedriver could not start a session; resolving one instead")
+        if clone:
+            provisioning.remove_clone(clone)
+        return webdriver.Chrome(options=options)
+    # Deleted by quit_driver once the browser is gone
+    driver.profile_clone = clone
+    return driver
+
+
+def quit_driver(driver):
+    """Quit a browser from create_driver and delete its profile clone"""
+    try:
+        driver.quit()
+    finally:
+        clone = getattr(driver, "profile_clone", None)
+        if clone:
+            provisioning.remove_clone(clone)
@@ -0,0 +1,158 @@
+"""
+Per-test duration and outcome history in a local SQLite database
+(.pytest_cache/d/saucedemo/history.sqlite), and the scheduling built on it:
+longest-first ordering, failing-first ordering and time-budget selection.
+"""
+import os
+import sqlite3
+import time
+from collections import namedtuple
+
+# Runs per test that the averages are taken over; older rows are pruned
+HISTORY = 20
+
+# Worth of a test in --time-budget selection: every test is worth 1, a test
+# that failed in every recent run is worth 1 + FAILURE_WEIGHT
+FAILURE_WEIGHT = 10
+
+# Never-seen tests are always picked first by --time-budget
+UNKNOWN_VALUE = float("inf")
+
+TestStats = namedtuple("TestStats", "seconds failure_rate runs")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    nodeid   TEXT NOT NULL,
+    finished REAL NOT NULL,
+    seconds  REAL NOT NULL,
+    failed   INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_by_test ON results (nodeid, finished);
+"""
+
+
+def database(config):
+    """Path of the history database, or None without the cache plugin (-p no:cacheprovider)"""
+    cache = getattr(config, "cache", None)
+    if cache is None:
+        return None
+    return os.path.join(str(cache.mkdir("saucedemo")), "history.sqlite")
+
+
+def _connect(path):
+    connection = sqlite3.connect(path, timeout=30)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def load(config):
+    """{nodeid: TestStats} averaged over each test's last HISTORY runs"""
+    path = database(config)
+    if path is None:
+        return {}
+    with _connect(path) as connection:
+        rows = connection.execute(
+            """
+            SELECT nodeid, AVG(seconds), AVG(failed), COUNT(*) FROM (
+                SELECT nodeid, seconds, failed,
+                       ROW_NUMBER() OVER (PARTITION BY nodeid ORDER BY finished DESC) AS age
+                FROM results
+            ) WHERE age <= ? GROUP BY nodeid
+            """,
+            (HISTORY,),
+        ).fetchall()
+    return {nodeid: TestStats(round(seconds, 3), failure_rate, runs) for nodeid, seconds, failure_rate, runs in rows}
+
+
+def save(config, measured, failed=()):
+    """Add this run's durations ({nodeid: seconds}) and failures (node ids) to the history"""
+    path = database(config)
+    if path is None:
+        return
+    finished = time.time()
+    with _connect(path) as connection:
+        connection.executemany(
+            "INSERT INTO results (nodeid, finished, seconds, failed) VALUES (?, ?, ?, ?)",
+            [(nodeid, finished, seconds, nodeid in failed) for nodeid, seconds in measured.items()],
+        )
+        connection.execute(
+            """
+            DELETE FROM results WHERE rowid IN (
+                SELECT rowid FROM (
+                    SELECT rowid, ROW_NUMBER() OVER (PARTITION BY nodeid ORDER BY finished DESC) AS age
+                    FROM results
+                ) WHERE age > ?
+            )
+            """,
+            (HISTORY,),
+        )
+
+
+def _default_seconds(items, history):
+    known = [history[item.nodeid].seconds for item in items if item.nodeid in history]
+    return sum(known) / len(known) if known else 0
+
+
+def _module(item):
+    return item.nodeid.split("::")[0]
+
+
+def longest_first(items, history, failing_first=False):
+    """
+    Order items by historical duration, slowest module first and slowest test
+    first within its module.
+
+    xdist's load scheduler hands tests out in collection order, so putting the
+    long ones first keeps a worker from picking up a slow checkout flow at the
+    very end while the others sit idle. A module's tests stay together so its
+    module-scoped fixtures (the login browser, the flow checkpoints) are built
+    once instead of once per interleaved test. Tests without history are
+    treated as average-length. With ``failing_first`` the modules, and the tests
+    within them, that failed most often recently come before everything else,
+    so a broken build fails fast.
+    """
+    default = _default_seconds(items, history)
+
+    def key(item):
+        stats = history.get(item.nodeid)
+        seconds = stats.seconds if stats else default
+        failure_rate = stats.failure_rate if stats and failing_first else 0
+        return failure_rate, seconds
+
+    modules = {}
+    for item in items:
+        failure_rate, seconds = key(item)
+        worst, total = modules.get(_module(item), (0, 0))
+        modules[_module(item)] = max(worst, failure_rate), total + seconds
+
+    items.sort(key=lambda item: (modules[_module(item)], _module(item), key(item)), reverse=True)
+
+
+def within_budget(items, history, seconds, workers=1):
+    """
+    Pick the most valuable tests that fit in ``seconds`` of wall time on
+    ``workers`` processes: greedily by value per second, where value grows
+    with the recent failure rate and unknown tests always go first.
+    Returns (selected, deselected, estimated seconds of the selection).
+    """
+    default = _default_seconds(items, history)
+    capacity = seconds * workers
+
+    def cost(item):
+        stats = history.get(item.nodeid)
+        return stats.seconds if stats else default
+
+    def density(item):
+        stats = history.get(item.nodeid)
+        value = 1 + FAILURE_WEIGHT * stats.failure_rate if stats else UNKNOWN_VALUE
+        return value / max(cost(item), 0.001)
+
+    chosen, used = set(), 0.0
+    for item in sorted(items, key=density, reverse=True):
+        if used + cost(item) <= capacity:
+            chosen.add(item.nodeid)
+            used += cost(item)
+
+    selected = [item for item in items if item.nodeid in chosen]
+    deselected = [item for item in items if item.nodeid not in chosen]
+    return selected, deselected, used / workers
@@ -0,0 +1,145 @@
+"""
+Flaky-test tracking, in-process retries and a quarantine lane.
+
+Every test attempt's outcome is kept in the pytest cache. A test's
+flakiness score is how often its outcome flips between consecutive
+attempts: a test that always fails is broken, not flaky, and scores 0.
+Tests that flip often enough are quarantined: ``--flaky-lane stable``
+leaves them out, ``--flaky-lane quarantine`` runs only them.
+"""
+import pytest
+from _pytest.runner import CallInfo, runtestprotocol
+
+CACHE_KEY = "saucedemo/flaky"
+
+# Attempts kept per test
+HISTORY = 50
+
+# Quarantined once at least MIN_ATTEMPTS are known and the flip rate reaches QUARANTINE_SCORE
+MIN_ATTEMPTS = 5
+QUARANTINE_SCORE = 0.2
+
+LANES = ("all", "stable", "quarantine")
+
+
+def score(attempts):
+    """Share of consecutive attempts whose outcome differs (0 = stable, 1 = alternates every time)"""
+    if len(attempts) < 2:
+        return 0.0
+    flips = sum(1 for previous, current in zip(attempts, attempts[1:]) if previous != current)
+    return flips / (len(attempts) - 1)
+
+
+def is_quarantined(attempts):
+    return len(attempts) >= MIN_ATTEMPTS and score(attempts) >= QUARANTINE_SCORE
+
+
+class FlakyPlugin:
+    """
+    Registered by conftest. With ``retries`` > 0 a failed test is run again
+    straight away in the same process; the session's warm pooled browser
+    serves the retry, and only the last attempt's report counts (earlier ones
+    are reported as "rerun").
+    """
+
+    def __init__(self, config, retries=0, lane="all"):
+        self.config = config
+        self.retries = retries
+        self.lane = lane
+        self.history = {}
+        self.attempts = {}
+        self.passed_on_retry = []
+
+    def pytest_sessionstart(self, session):
+        # The cache plugin is only configured after conftest registers this plugin,
+        # and not at all under -p no:cacheprovider (no history then)
+        cache = getattr(session.config, "cache", None)
+        if cache is not None:
+            self.history = cache.get(CACHE_KEY, {})
+
+    def pytest_collection_modifyitems(self, config, items):
+        if self.lane == "all":
+            return
+        quarantine = {
+            item.nodeid for item in items
+            if item.get_closest_marker("quarantine") or is_quarantined(self.history.get(item.nodeid, []))
+        }
+        keep = [item for item in items if (item.nodeid in quarantine) == (self.lane == "quarantine")]
+        dropped = [item for item in items if item not in keep]
+        if dropped:
+            config.hook.pytest_deselected(items=dropped)
+            items[:] = keep
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        if not self.retries:
+            return None
+
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            # Until the last attempt, tear down only up to the test's parent so
+            # module and session fixtures (browsers, checkpoints) stay up
+            reports = runtestprotocol(item, nextitem=nextitem if last else item.parent, log=False)
+            failed = any(report.failed for report in reports)
+            if not failed and not last:
+                self._finish_teardown(item, nextitem, reports)
+            if not failed or last:
+                break
+            for report in reports:
+                if report.failed:
+                    report.outcome = "rerun"
+                item.ihook.pytest_runtest_logreport(report=report)
+
+        for report in reports:
+            item.ihook.pytest_runtest_logreport(report=report)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+        return True
+
+    @staticmethod
+    def _finish_teardown(item, nextitem, reports):
+        """An early attempt passed: tear down what it left up and ``nextitem`` doesn't need"""
+        if item.session.shouldfail or item.session.shouldstop:
+            nextitem = None
+        call = CallInfo.from_call(lambda: item.session._setupstate.teardown_exact(nextitem), "teardown")
+        if call.excinfo is not None:
+            # A failing module or session finalizer is the test's teardown error
+            reports[-1] = item.ihook.pytest_runtest_makereport(item=item, call=call)
+
+    def pytest_report_teststatus(self, report):
+        if report.outcome == "rerun":
+            return "rerun", "R", ("RERUN", {"yellow": True})
+        return None
+
+    def pytest_runtest_logreport(self, report):
+        # Under xdist this runs in the controller, which sees every worker's reports
+        if report.when == "call" or (report.when == "setup" and report.outcome != "passed"):
+            if report.skipped:
+                return
+            attempts = self.attempts.setdefault(report.nodeid, [])
+            attempts.append("pass" if report.passed else "fail")
+            if report.passed and len(attempts) > 1:
+                self.passed_on_retry.append(report.nodeid)
+
+    def pytest_sessionfinish(self, session):
+        cache = getattr(session.config, "cache", None)
+        if hasattr(session.config, "workerinput") or cache is None or not self.attempts:
+            return
+        for nodeid, attempts in self.attempts.items():
+            self.history[nodeid] = (self.history.get(nodeid, []) + attempts)[-HISTORY:]
+        cache.set(CACHE_KEY, self.history)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        flaky = sorted(
+            ((score(attempts), nodeid) for nodeid, attempts in self.history.items() if score(attempts) > 0),
+            reverse=True,
+        )
+        if not flaky and not self.passed_on_retry:
+            return
+        terminalreporter.section("flaky tests")
+        for nodeid in self.passed_on_retry:
+            terminalreporter.write_line(f"passed on retry: {nodeid}")
+        for value, nodeid in flaky[:10]:
+            attempts = self.history[nodeid]
+            marker = "  [quarantined]" if is_quarantined(attempts) else ""
+            terminalreporter.write_line(f"{value:5.2f} flip rate over {len(attempts):2d} attempts  {nodeid}{marker}")
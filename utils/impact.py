@@ -0,0 +1,291 @@
+"""
+Change-impact test selection.
+
+``--record-impact`` records, per test, every function under pages/ it ran
+(sys.setprofile, so only page-object code is looked at). ``--impact`` then
+diffs the working tree against the commit the recording was made at, maps
+the changed lines of pages/*.py onto methods and locators with the ast
+module, and keeps only the tests that ran one of them. Page-object code
+run once for many tests - module and session fixtures, flow checkpoints -
+counts for every test that uses them. Anything it can't
+map - conftest, utils, config - or coverage that is missing or too old
+falls back to the full suite.
+"""
+import ast
+import contextlib
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+CACHE_KEY = "saucedemo/impact"
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES_ROOT = os.path.join(ROOT, "pages") + os.sep
+
+# Coverage recorded more commits ago than this is not trusted
+MAX_AGE_COMMITS = 50
+
+# Changes here can't affect a test run
+IGNORED_PREFIXES = ("benchmarks/", "reports/", "screenshots/", "artifacts/")
+IGNORED_SUFFIXES = (".md", ".png", ".gitignore")
+
+_HUNK = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+# The session's ImpactRecorder while --record-impact is on
+_active = None
+
+
+def _git(*args):
+    result = subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"git {' '.join(args)} failed")
+    return result.stdout.strip()
+
+
+def head_commit():
+    return _git("rev-parse", "HEAD")
+
+
+@contextlib.contextmanager
+def shared(key):
+    """Page-object code run inside counts for every test that calls uses(key), not only this one"""
+    if _active is None:
+        yield
+        return
+    with _active.sharing(key):
+        yield
+
+
+def uses(key):
+    """The running test depends on what ran under shared(key)"""
+    if _active is not None:
+        _active.use(key)
+
+
+class ImpactRecorder:
+    """pytest plugin registered by conftest for ``--record-impact``"""
+
+    def __init__(self):
+        self.current = None
+        # {key: functions} run under shared(), e.g. by a module fixture's setup
+        self.shared = {}
+
+    def pytest_configure(self, config):
+        global _active
+        _active = self
+
+    def pytest_unconfigure(self, config):
+        global _active
+        _active = None
+
+    @contextlib.contextmanager
+    def sharing(self, key):
+        outer = self.current
+        self.current = self.shared.setdefault(key, set())
+        try:
+            yield
+        finally:
+            self.current = outer
+
+    def use(self, key):
+        if self.current is not None:
+            self.current.update(self.shared.get(key, ()))
+
+    def _profile(self, frame, event, arg):
+        if event == "call" and frame.f_code.co_filename.startswith(PAGES_ROOT):
+            code = frame.f_code
+            self.current.add(f"{os.path.relpath(code.co_filename, ROOT)}:{code.co_qualname}")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        # A module or session fixture is set up for the first test that needs it only
+        if fixturedef.scope == "function" or self.current is None:
+            yield
+        else:
+            with self.sharing(f"fixture {fixturedef.argname}"):
+                yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        item.impact = self.current = set()
+        sys.setprofile(self._profile)
+        yield
+        sys.setprofile(None)
+        for name in item.fixturenames:
+            self.use(f"fixture {name}")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        sys.setprofile(self._profile)
+        yield
+        sys.setprofile(None)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item):
+        sys.setprofile(self._profile)
+        yield
+        sys.setprofile(None)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        if call.when == "teardown" and hasattr(item, "impact"):
+            # Travels to the xdist controller with the report
+            outcome.get_result().user_properties.append(("impact", sorted(item.impact)))
+
+
+def load(config):
+    # No cache plugin (-p no:cacheprovider): nothing recorded
+    cache = getattr(config, "cache", None)
+    return cache.get(CACHE_KEY, None) if cache is not None else None
+
+
+def save(config, recorded):
+    """
+    Store {nodeid: [function, ...]} for this commit. Entries recorded at the
+    same commit are kept, so a partial run adds to the coverage.
+    """
+    if getattr(config, "cache", None) is None:
+        return
+    commit = head_commit()
+    previous = load(config)
+    tests = previous["tests"] if previous and previous.get("commit") == commit else {}
+    tests.update(recorded)
+    config.cache.set(CACHE_KEY, {"commit": commit, "tests": tests})
+
+
+def changed_lines(base):
+    """{repo path: set of changed line numbers (None: whole file)} between ``base`` and the working tree"""
+    changes = {}
+    path = None
+    for line in _git("diff", "-U0", "--no-color", base).splitlines():
+        if line.startswith("--- "):
+            old = line[4:]
+            path = old[2:] if old != "/dev/null" else None
+        elif line.startswith("+++ "):
+            new = line[4:]
+            if new != "/dev/null":
+                path = new[2:]
+            elif path:
+                changes[path] = None
+                path = None
+                continue
+            changes.setdefault(path, set())
+        elif path and changes.get(path) is not None:
+            match = _HUNK.match(line)
+            if match:
+                start = int(match.group(3))
+                count = int(match.group(4) or 1)
+                # A pure deletion (count 0) is attributed to the line it happened after
+                changes[path].update(range(start, start + count) if count else [max(start, 1)])
+
+    for untracked in _git("ls-files", "--others", "--exclude-standard").splitlines():
+        changes[untracked] = None
+    return changes
+
+
+def page_map(path):
+    """
+    Functions and locators of a page-object module.
+    Returns (functions, locators, uses): functions is [(first, last, qualname)],
+    locators is {line: name} for class-level tuple constants, uses is
+    {qualname: attribute names it reads}.
+    """
+    with open(os.path.join(ROOT, path)) as f:
+        tree = ast.parse(f.read())
+
+    functions, locators, uses = [], {}, {}
+
+    def visit(node, prefix):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.ClassDef):
+                for statement in child.body:
+                    if isinstance(statement, ast.Assign) and isinstance(statement.value, ast.Tuple):
+                        for target in statement.targets:
+                            if isinstance(target, ast.Name):
+                                for line in range(statement.lineno, statement.end_lineno + 1):
+                                    locators[line] = target.id
+                visit(child, f"{prefix}{child.name}.")
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                qualname = prefix + child.name
+                first = min([child.lineno] + [d.lineno for d in child.decorator_list])
+                functions.append((first, child.end_lineno, qualname))
+                uses[qualname] = {n.attr for n in ast.walk(child) if isinstance(n, ast.Attribute)}
+                visit(child, f"{qualname}.<locals>.")
+
+    visit(tree, "")
+    return functions, locators, uses
+
+
+def affected_functions(path, lines):
+    """Qualified function names in pages module ``path`` touched by ``lines`` (None: all of them)"""
+    if lines is None or not os.path.exists(os.path.join(ROOT, path)):
+        return None
+
+    functions, locators, uses = page_map(path)
+    affected = set()
+    for line in lines:
+        enclosing = [f for f in functions if f[0] <= line <= f[1]]
+        if enclosing:
+            # Innermost definition
+            affected.add(max(enclosing, key=lambda f: f[0])[2])
+        elif line in locators:
+            affected.update(name for name, attributes in uses.items() if locators[line] in attributes)
+        else:
+            # Imports, module constants, scripts: anything in the file may depend on them
+            return None
+    return affected
+
+
+def select(nodeids, data, changes):
+    """
+    Tests to run for ``changes`` given recorded coverage ``data``.
+    Returns (set of node ids, reason) or (None, reason) for a full run.
+    """
+    tests = data["tests"]
+    selected = {nodeid for nodeid in nodeids if nodeid not in tests}  # never recorded: always run
+    changed_functions = set()
+
+    for path, lines in sorted(changes.items()):
+        if path.startswith(IGNORED_PREFIXES) or path.endswith(IGNORED_SUFFIXES):
+            continue
+        if path.startswith("pages/") and path.endswith(".py"):
+            affected = affected_functions(path, lines)
+            if affected is None:
+                selected.update(n for n in nodeids if any(f.startswith(path + ":") for f in tests.get(n, ())))
+            else:
+                changed_functions.update(f"{path}:{name}" for name in affected)
+        elif path.startswith("tests/test_") and path.endswith(".py"):
+            selected.update(n for n in nodeids if n.startswith(path + "::"))
+        else:
+            return None, f"{path} changed"
+
+    selected.update(n for n in nodeids if changed_functions.intersection(tests.get(n, ())))
+    return selected, f"{len(selected)} of {len(nodeids)} tests affected by changes since {data['commit'][:10]}"
+
+
+def select_items(config, items):
+    """Deselect tests the changes can't affect; returns the reason for the selection made"""
+    data = load(config)
+    if not data:
+        return "no impact data recorded (run with --record-impact first); running everything"
+    try:
+        age = int(_git("rev-list", "--count", f"{data['commit']}..HEAD"))
+        changes = changed_lines(data["commit"])
+    except RuntimeError:
+        return "impact data refers to an unknown commit; running everything"
+    if age > MAX_AGE_COMMITS:
+        return f"impact data is {age} commits old; running everything"
+
+    selected, reason = select([item.nodeid for item in items], data, changes)
+    if selected is None:
+        return f"{reason}; running everything"
+
+    deselected = [item for item in items if item.nodeid not in selected]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in selected]
+    return reason
@@ -0,0 +1,217 @@
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+
+import pytest
+
+from utils.paths import REPORTS_DIR, artifact_dir, safe_name
+
+PAGES_DIR = os.sep + "pages" + os.sep
+
+# Recorder of the running test; page objects report their waits to it
+active = None
+
+
+class CommandRecorder:
+    """
+    Records every WebDriver command a test sends, with its latency, the test
+    phase it happened in and the page-object method that issued it.
+
+    ``attach`` wraps the driver's ``execute`` method, which every Selenium call
+    (driver and WebElement alike) goes through, so nothing in the page objects
+    has to change.
+    """
+
+    def __init__(self, nodeid):
+        self.nodeid = nodeid
+        self.started = time.monotonic()
+        self.phase = "setup"
+        self.phases = {}
+        self.commands = []
+        self.waits = []
+        self.events = []
+
+    def attach(self, driver):
+        original = driver.execute
+
+        def execute(driver_command, params=None):
+            source = _page_object_caller()
+            start = time.monotonic()
+            try:
+                return original(driver_command, params)
+            finally:
+                self.commands.append({
+                    "t": round(start - self.started, 4),
+                    "phase": self.phase,
+                    "command": driver_command,
+                    "seconds": round(time.monotonic() - start, 4),
+                    "source": source,
+                })
+
+        # A browser context's driver already has an execute of its own (see utils/contexts.py)
+        execute.previous = driver.__dict__.get("execute")
+        driver.execute = execute
+
+    @staticmethod
+    def detach(driver):
+        # Drop the instance attribute so the class method is used again, or put back
+        # the execute attach wrapped
+        previous = getattr(driver.__dict__.pop("execute", None), "previous", None)
+        if previous is not None:
+            driver.execute = previous
+
+    def start_phase(self, name):
+        self.phase = name
+        self._phase_start = time.monotonic()
+
+    def end_phase(self):
+        self.phases[self.phase] = round(time.monotonic() - self._phase_start, 4)
+
+    def record_event(self, name, seconds, **details):
+        self.events.append(dict(name=name, phase=self.phase, seconds=round(seconds, 4), **details))
+
+    def record_wait(self, page, description, seconds, timed_out):
+        self.waits.append({
+            "t": round(time.monotonic() - self.started - seconds, 4),
+            "phase": self.phase,
+            "page": page,
+            "description": description,
+            "seconds": round(seconds, 4),
+            "timed_out": timed_out,
+        })
+
+    def timeline(self):
+        by_source = defaultdict(lambda: {"commands": 0, "seconds": 0.0})
+        for command in self.commands:
+            entry = by_source[command["source"] or "(test code)"]
+            entry["commands"] += 1
+            entry["seconds"] = round(entry["seconds"] + command["seconds"], 4)
+
+        return {
+            "test": self.nodeid,
+            "phases": self.phases,
+            "events": self.events,
+            "commands": self.commands,
+            "waits": self.waits,
+            "summary": {
+                "commands": len(self.commands),
+                "command_seconds": round(sum(c["seconds"] for c in self.commands), 4),
+                "wait_seconds": round(sum(w["seconds"] for w in self.waits), 4),
+                "by_source": dict(by_source),
+            },
+        }
+
+    def write(self):
+        """Save the timeline as reports/timelines[/<worker>]/<test>.json and return the path"""
+        path = os.path.join(artifact_dir(os.path.join(REPORTS_DIR, "timelines")), safe_name(self.nodeid) + ".json")
+        with open(path, "w") as f:
+            json.dump(self.timeline(), f, indent=2)
+        return path
+
+
+def record_wait(page, description, seconds, timed_out):
+    if active is not None:
+        active.record_wait(page, description, seconds, timed_out)
+
+
+def _page_object_caller():
+    """Page-object method that issued the command, e.g. "CheckoutPage.fill_checkout_info" """
+    frame = sys._getframe(2)
+    while frame is not None:
+        if PAGES_DIR in frame.f_code.co_filename and "self" in frame.f_locals:
+            # Skip the generic BasePage helpers so the method that called them gets the credit
+            owner = type(frame.f_locals["self"]).__name__
+            caller = frame
+            while caller.f_back is not None and PAGES_DIR in caller.f_back.f_code.co_filename \
+                    and caller.f_back.f_locals.get("self") is frame.f_locals["self"]:
+                caller = caller.f_back
+            return f"{owner}.{caller.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+class SlowestCommands:
+    """Aggregates command latency over the whole session for the terminal summary"""
+
+    def __init__(self):
+        self.totals = defaultdict(lambda: [0, 0.0, 0.0])
+
+    def add(self, timeline):
+        for command in timeline["commands"]:
+            key = (command["command"], command["source"] or "(test code)")
+            total = self.totals[key]
+            total[0] += 1
+            total[1] += command["seconds"]
+            total[2] = max(total[2], command["seconds"])
+
+    def top(self, limit=10):
+        rows = sorted(self.totals.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return [(command, source, count, seconds, slowest) for (command, source), (count, seconds, slowest) in rows]
+
+
+class InstrumentationPlugin:
+    """
+    pytest side of the recorder, registered by conftest when ``--instrument`` is given.
+    Each test gets a CommandRecorder; its timeline is written to
+    reports/timelines/, attached to the pytest-html report and folded into a
+    "slowest WebDriver commands" section at the end of the run.
+    """
+
+    def __init__(self):
+        self.slowest = SlowestCommands()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        global active
+        item.recorder = active = CommandRecorder(item.nodeid)
+        item.recorder.start_phase("setup")
+        yield
+        item.recorder.end_phase()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        item.recorder.start_phase("call")
+        yield
+        item.recorder.end_phase()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item):
+        item.recorder.start_phase("teardown")
+        yield
+        item.recorder.end_phase()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        global active
+        outcome = yield
+        if call.when != "teardown" or not hasattr(item, "recorder"):
+            return
+
+        report = outcome.get_result()
+        timeline = item.recorder.timeline()
+        report.user_properties.append(("timeline", item.recorder.write()))
+        try:
+            import pytest_html
+            report.extras = getattr(report, "extras", []) + [pytest_html.extras.json(timeline, name="Timeline")]
+        except ImportError:
+            pass
+        active = None
+
+    def pytest_runtest_logreport(self, report):
+        # Runs in the controller under xdist too, so read the timeline back from disk
+        for name, value in report.user_properties:
+            if name == "timeline" and os.path.exists(value):
+                with open(value) as f:
+                    self.slowest.add(json.load(f))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        rows = self.slowest.top()
+        if not rows:
+            return
+        terminalreporter.section("slowest WebDriver commands")
+        for command, source, count, seconds, slowest in rows:
+            terminalreporter.write_line(
+                f"{seconds:8.3f}s total  {count:5d}x  max {slowest:.3f}s  {command:<22} {source}"
+            )
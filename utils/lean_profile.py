@@ -0,0 +1,53 @@
+"""
+Runtime half of the "lean browser" profile.
+
+Launch flags (utils/driver_factory.LEAN_ARGUMENTS) switch off extensions and
+background networking for good. Resource blocking and animation removal are
+applied over DevTools instead, so a pooled browser can be switched back to a
+full profile for a single test (@pytest.mark.full_browser) and lean again
+for the next one without a relaunch.
+"""
+import json
+
+# Requests that never matter to a functional check: images, fonts, analytics/telemetry
+BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*backtrace.io*", "*optimizely.com*", "*segment.io*", "*hotjar.com*",
+]
+
+NO_ANIMATIONS_CSS = "*, *::before, *::after { transition: none !important; animation: none !important; }"
+
+# Runs before the page's own scripts on every navigation
+NO_ANIMATIONS_SCRIPT = """
+(function () {
+    var add = function () {
+        var style = document.createElement("style");
+        style.textContent = %s;
+        (document.head || document.documentElement).appendChild(style);
+    };
+    if (document.documentElement) {
+        add();
+    } else {
+        document.addEventListener("DOMContentLoaded", add);
+    }
+})();
+""" % json.dumps(NO_ANIMATIONS_CSS)
+
+
+def apply(driver, enabled):
+    """Switch blocking and animations on/off; a no-op when the browser is already in that state"""
+    current = getattr(driver, "lean_profile", None)
+    if (current is not None) == enabled:
+        return
+
+    if enabled:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+        script = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": NO_ANIMATIONS_SCRIPT})
+        driver.lean_profile = script["identifier"]
+    else:
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})
+        driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": current})
+        driver.lean_profile = None
@@ -0,0 +1,32 @@
+import os
+import re
+
+SCREENSHOTS_DIR = "screenshots"
+REPORTS_DIR = "reports"
+ARTIFACTS_DIR = "artifacts"
+
+
+def worker_id():
+    """xdist worker name ("gw0", "gw1", ...) or "master" when running serially"""
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+def safe_name(name):
+    """Turn a test name/node id into something usable as a file name"""
+    return re.sub(r"[^\w.-]+", "_", name).strip("_")
+
+
+def artifact_dir(root):
+    """
+    Directory for artifacts written by the current process.
+    Serial runs write straight into ``root``; xdist workers each get their own
+    sub-directory so parallel tests never fight over the same file name.
+    """
+    worker = worker_id()
+    path = root if worker == "master" else os.path.join(root, worker)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def screenshot_path(name):
+    return os.path.join(artifact_dir(SCREENSHOTS_DIR), safe_name(name) + ".png")
@@ -0,0 +1,227 @@
+"""
+Ahead-of-time browser provisioning.
+
+Without it every ``webdriver.Chrome()`` asks Selenium Manager to find (and
+possibly download) a matching chromedriver before Chrome even starts.
+``python -m utils.provisioning`` does that once: it resolves the
+chromedriver/Chrome pair, copies the driver into .browsers/, records both in
+.browsers/manifest.json and warms up a Chrome profile template. From then on
+create_driver starts sessions offline from the pinned pair, each in a
+copy-on-write clone of the template instead of an empty profile.
+
+When the Chrome the pair was resolved for is the auto-updating system
+browser, an update can leave the pinned chromedriver a major version
+behind. The manifest is then ignored (and rebuilt by the next provisioning
+run) instead of failing every session.
+"""
+import argparse
+import atexit
+import json
+import logging
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+
+from selenium.common.exceptions import WebDriverException
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROVISION_DIR = os.path.join(ROOT, ".browsers")
+MANIFEST = os.path.join(PROVISION_DIR, "manifest.json")
+PROFILE_TEMPLATE = os.path.join(PROVISION_DIR, "profile-template")
+
+# Where the system Chrome usually lives when Selenium Manager didn't download one
+SYSTEM_CHROME_NAMES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+
+logger = logging.getLogger(__name__)
+
+# Versions of binaries already asked this process, by (path, mtime): an update replaces the file
+_versions = {}
+
+# Profile clones of this process; each is removed when its browser quits
+# (driver_factory.quit_driver), whatever is left at exit
+_clones = []
+
+
+def load_manifest():
+    """The pinned pair, or None when provisioning hasn't run (or its files are gone)"""
+    if not os.path.exists(MANIFEST):
+        return None
+    with open(MANIFEST) as f:
+        manifest = json.load(f)
+    if not os.path.exists(manifest["chromedriver"]):
+        return None
+    if manifest.get("chrome") and not os.path.exists(manifest["chrome"]):
+        return None
+    if not chrome_matches(manifest):
+        logger.warning(
+            "Chrome was updated since chromedriver %s was pinned; ignoring %s "
+            "(run python -m utils.provisioning to pin a matching pair)",
+            manifest["chromedriver_version"], MANIFEST,
+        )
+        return None
+    return manifest
+
+
+def chrome_matches(manifest):
+    """
+    Whether the Chrome sessions will run still has chromedriver's major version.
+    True when that can't be told (unknown binary or version): create_driver
+    falls back to Selenium Manager if the session then fails to start.
+    """
+    binary = manifest.get("chrome") or manifest.get("system_chrome")
+    pinned = manifest.get("chromedriver_version") or manifest.get("chrome_version")
+    if not binary or not pinned or not os.path.exists(binary):
+        return True
+    key = (binary, os.stat(binary).st_mtime)
+    if key not in _versions:
+        _versions[key] = _version(binary)
+    current = _versions[key]
+    return current is None or current.split(".")[0] == pinned.split(".")[0]
+
+
+def system_chrome():
+    for name in SYSTEM_CHROME_NAMES:
+        path = shutil.which(name)
+        if path:
+            return os.path.realpath(path)
+    return None
+
+
+def _version(binary):
+    try:
+        output = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=30).stdout
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    # "ChromeDriver 120.0.6099.109 (...)" / "Google Chrome 120.0.6099.109"
+    for word in output.split():
+        if word[:1].isdigit() and "." in word:
+            return word
+    return None
+
+
+def resolve():
+    """(chromedriver path, Chrome path or None for the system Chrome) for a matching pair"""
+    from utils.driver_factory import build_chrome_options
+
+    options = build_chrome_options()
+    try:
+        from selenium.webdriver.common.selenium_manager import SeleniumManager
+        # Sets options.binary_location when it had to download Chrome for Testing
+        driver = SeleniumManager().driver_location(options)
+        return driver, options.binary_location or None
+    except WebDriverException:
+        from webdriver_manager.chrome import ChromeDriverManager
+        return ChromeDriverManager().install(), None
+
+
+def provision(force=False):
+    """Resolve and pin the driver/browser pair and build the profile template; returns the manifest"""
+    manifest = load_manifest()
+    if manifest and not force:
+        return manifest
+
+    os.makedirs(PROVISION_DIR, exist_ok=True)
+    driver_source, chrome = resolve()
+    driver_version = _version(driver_source)
+    # The system Chrome is only recorded to notice its updates, never pinned as binary_location
+    installed = None if chrome else system_chrome()
+    chrome_version = _version(chrome or installed) if chrome or installed else None
+    if driver_version and chrome_version and driver_version.split(".")[0] != chrome_version.split(".")[0]:
+        raise RuntimeError(f"chromedriver {driver_version} does not match Chrome {chrome_version}")
+
+    # A private copy, so clearing the Selenium/wdm cache doesn't break the pin
+    driver = os.path.join(PROVISION_DIR, f"chromedriver-{driver_version or 'unknown'}")
+    if sys.platform == "win32":
+        driver += ".exe"
+    shutil.copy2(driver_source, driver)
+    os.chmod(driver, os.stat(driver).st_mode | stat.S_IEXEC)
+
+    manifest = {
+        "chromedriver": driver,
+        "chromedriver_version": driver_version,
+        "chrome": chrome,
+        "chrome_version": chrome_version,
+        "system_chrome": installed,
+        "profile_template": PROFILE_TEMPLATE,
+    }
+    with open(MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    build_profile_template(manifest)
+    return manifest
+
+
+def build_profile_template(manifest):
+    """
+    Start Chrome once on a fresh user-data-dir and open the app, so the first-run
+    work (profile creation, component and cache initialization) is done and kept.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from utils.config import app_url
+    from utils.driver_factory import build_chrome_options
+
+    shutil.rmtree(PROFILE_TEMPLATE, ignore_errors=True)
+    options = build_chrome_options()
+    options.add_argument(f"--user-data-dir={PROFILE_TEMPLATE}")
+    if manifest["chrome"]:
+        options.binary_location = manifest["chrome"]
+
+    driver = webdriver.Chrome(service=Service(manifest["chromedriver"]), options=options)
+    try:
+        driver.get(app_url())
+    finally:
+        driver.quit()
+
+    # Locks and crash state of the warm-up session must not be cloned
+    for name in ("SingletonLock", "SingletonCookie", "SingletonSocket"):
+        path = os.path.join(PROFILE_TEMPLATE, name)
+        if os.path.lexists(path):
+            os.remove(path)
+
+
+def clone_profile(template=PROFILE_TEMPLATE):
+    """
+    Private copy of the profile template for one session. ``cp --reflink=auto``
+    shares the data blocks on copy-on-write filesystems (btrfs, XFS, APFS via
+    clonefile) and falls back to a plain copy elsewhere.
+    """
+    target = tempfile.mkdtemp(prefix="saucedemo-profile-")
+    _clones.append(target)
+    if shutil.which("cp") and sys.platform.startswith("linux"):
+        result = subprocess.run(["cp", "-a", "--reflink=auto", template + "/.", target], capture_output=True)
+        if result.returncode == 0:
+            return target
+    shutil.copytree(template, target, dirs_exist_ok=True)
+    return target
+
+
+def remove_clone(path):
+    """Delete one profile clone once its browser is gone"""
+    if path in _clones:
+        _clones.remove(path)
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@atexit.register
+def _remove_clones():
+    for path in list(_clones):
+        remove_clone(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pin chromedriver/Chrome and build the profile template")
+    parser.add_argument("--force", action="store_true", help="Resolve again even if a pinned pair exists")
+    args = parser.parse_args()
+
+    manifest = provision(force=args.force)
+    print(f"chromedriver {manifest['chromedriver_version']}: {manifest['chromedriver']}")
+    print(f"chrome       {manifest['chrome_version'] or '(system)'}: {manifest['chrome'] or '(system)'}")
+    print(f"profile      {manifest['profile_template']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Streaming test results: one JSON line per test phase, written as it completes.
+
+Each process appends to reports/results[/<worker>]/<run>.jsonl, so there is
+something to look at while a long run is still going and nothing is held
+in memory. The CLI reads those files back:
+
+    python -m utils.results tail [--follow]        # latest run, as it happens
+    python -m utils.results aggregate [--runs 10]  # per-test stats across runs and workers
+    python -m utils.results html [RUN] [-o FILE]   # rebuild an HTML report offline
+"""
+import argparse
+import glob
+import html
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+
+import pytest
+
+from utils.paths import REPORTS_DIR, artifact_dir, worker_id
+
+RESULTS_DIR = os.path.join(REPORTS_DIR, "results")
+
+# user_properties copied into every line
+ARTIFACT_PROPERTIES = ("artifacts", "timeline")
+
+
+class ResultSink:
+    """pytest plugin registered by conftest; every process writes its own file"""
+
+    def __init__(self, config):
+        self.config = config
+        self.file = None
+        self.run = getattr(config, "workerinput", {}).get("saucedemo_run") or time.strftime("%Y%m%d-%H%M%S")
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_configure_node(self, node):
+        # xdist controller: every worker writes under the same run name
+        node.workerinput["saucedemo_run"] = self.run
+
+    def _open(self):
+        if self.file is None:
+            path = os.path.join(artifact_dir(RESULTS_DIR), self.run + ".jsonl")
+            # Line buffered: each result is on disk as soon as it is written
+            self.file = open(path, "a", buffering=1)
+        return self.file
+
+    def pytest_runtest_logreport(self, report):
+        # Under xdist the controller sees the workers' reports too; they already wrote them
+        if hasattr(self.config, "workerinput") or not self.config.getoption("numprocesses", None):
+            self._open().write(json.dumps(to_line(self.run, report)) + "\n")
+
+    def pytest_sessionfinish(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+def to_line(run, report):
+    line = {
+        "run": run,
+        "test": report.nodeid,
+        "phase": report.when,
+        "outcome": report.outcome,
+        "duration": round(report.duration, 4),
+        "start": getattr(report, "start", None),
+        "stop": getattr(report, "stop", None),
+        "worker": worker_id(),
+    }
+    for name, value in report.user_properties:
+        if name in ARTIFACT_PROPERTIES:
+            line[name] = value
+    if report.failed:
+        line["longrepr"] = str(report.longrepr)
+    return line
+
+
+def result_files(run=None):
+    """{run: [jsonl paths of every worker]}, oldest run first"""
+    runs = defaultdict(list)
+    for path in glob.glob(os.path.join(RESULTS_DIR, "**", "*.jsonl"), recursive=True):
+        name = os.path.splitext(os.path.basename(path))[0]
+        if run is None or name == run:
+            runs[name].append(path)
+    return dict(sorted(runs.items()))
+
+
+def read_lines(paths):
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                # The last line of a file that is still being written may be partial
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def fold_phases(lines):
+    """
+    One result per test from its setup/call/teardown lines:
+    {test: {"outcome", "seconds", "worker", "reruns", ["longrepr"], ["artifacts"], ["timeline"]}}.
+    A failure outside the call phase is an "error"; a retried test counts its last attempt.
+    """
+    results = {}
+    for line in lines:
+        entry = results.setdefault(line["test"], {"outcome": "passed", "seconds": 0.0, "reruns": 0})
+        entry["seconds"] += line["duration"]
+        entry["worker"] = line["worker"]
+        if line["outcome"] == "rerun":
+            entry["reruns"] += 1
+            entry["outcome"] = "passed"
+            entry.pop("longrepr", None)
+        elif line["outcome"] != "passed" and entry["outcome"] == "passed":
+            failed_outside_call = line["outcome"] == "failed" and line["phase"] != "call"
+            entry["outcome"] = "error" if failed_outside_call else line["outcome"]
+            if "longrepr" in line:
+                entry["longrepr"] = line["longrepr"]
+        for name in ARTIFACT_PROPERTIES:
+            if name in line:
+                entry[name] = line[name]
+    return results
+
+
+def format_line(line):
+    return f"{line['outcome']:>8} {line['phase']:<8} {line['duration']:8.3f}s  {line['worker']:<6} {line['test']}"
+
+
+def tail(follow=False, interval=0.5):
+    runs = result_files()
+    if not runs:
+        sys.exit(f"no results under {RESULTS_DIR}")
+    run, paths = list(runs.items())[-1]
+    print(f"run {run} ({len(paths)} file(s))")
+    offsets = {}
+    while True:
+        # Workers may create their file after the tail started
+        for path in result_files(run).get(run, []):
+            with open(path) as f:
+                f.seek(offsets.get(path, 0))
+                for raw in iter(f.readline, ""):
+                    if not raw.endswith("\n"):
+                        break
+                    offsets[path] = f.tell()
+                    print(format_line(json.loads(raw)), flush=True)
+        if not follow:
+            return
+        time.sleep(interval)
+
+
+def aggregate(last=None):
+    runs = result_files()
+    if last:
+        runs = dict(list(runs.items())[-last:])
+    stats = defaultdict(lambda: {"runs": 0, "passed": 0, "failed": 0, "seconds": 0.0, "last": None})
+    for run, paths in runs.items():
+        for test, result in fold_phases(read_lines(paths)).items():
+            entry = stats[test]
+            entry["runs"] += 1
+            if result["outcome"] == "passed":
+                entry["passed"] += 1
+            elif result["outcome"] in ("failed", "error"):
+                entry["failed"] += 1
+            entry["seconds"] += result["seconds"]
+            entry["last"] = result["outcome"]
+
+    print(f"{len(runs)} run(s), {len(stats)} test(s)")
+    print(f"{'runs':>5} {'pass':>5} {'fail':>5} {'mean s':>8}  {'last':<8} test")
+    for test, entry in sorted(stats.items(), key=lambda item: item[1]["seconds"] / item[1]["runs"], reverse=True):
+        print(f"{entry['runs']:5d} {entry['passed']:5d} {entry['failed']:5d} "
+              f"{entry['seconds'] / entry['runs']:8.3f}  {entry['last']:<8} {test}")
+
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Test results {run}</title>
+<style>
+body {{ font-family: sans-serif; }} table {{ border-collapse: collapse; width: 100%; }}
+td, th {{ border: 1px solid #ccc; padding: 4px 8px; text-align: left; vertical-align: top; }}
+.passed {{ color: green; }} .failed, .error {{ color: red; }} .skipped {{ color: orange; }}
+pre {{ white-space: pre-wrap; margin: 0; }}
+</style></head><body>
+<h1>Test results {run}</h1>
+<p>{summary}</p>
+<table><tr><th>Result</th><th>Test</th><th>Duration</th><th>Worker</th><th>Details</th></tr>
+{rows}
+</table></body></html>
+"""
+
+
+def write_html(run=None, output=None):
+    runs = result_files(run)
+    if not runs:
+        sys.exit(f"no results for {run or 'any run'} under {RESULTS_DIR}")
+    run, paths = list(runs.items())[-1]
+    results = fold_phases(read_lines(paths))
+
+    counts = defaultdict(int)
+    rows = []
+    for test, result in sorted(results.items()):
+        outcome = result["outcome"]
+        counts[outcome] += 1
+        details = []
+        if result["reruns"]:
+            details.append(f"{result['reruns']} rerun(s)")
+        if result.get("longrepr"):
+            details.append(f"<pre>{html.escape(result['longrepr'])}</pre>")
+        artifacts = dict(result.get("artifacts") or {})
+        if result.get("timeline"):
+            artifacts["timeline"] = result["timeline"]
+        for kind, path in artifacts.items():
+            details.append(f'<a href="{html.escape(os.path.abspath(path))}">{html.escape(kind)}</a>')
+        rows.append(
+            f'<tr><td class="{outcome}">{outcome}</td><td>{html.escape(test)}</td>'
+            f'<td>{result["seconds"]:.2f}s</td><td>{html.escape(result["worker"])}</td><td>{" ".join(details)}</td></tr>'
+        )
+
+    output = output or os.path.join(REPORTS_DIR, f"results-{run}.html")
+    summary = ", ".join(f"{count} {outcome}" for outcome, count in sorted(counts.items()))
+    with open(output, "w") as f:
+        f.write(HTML_TEMPLATE.format(run=html.escape(run), summary=summary, rows="\n".join(rows)))
+    print(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read the JSON-lines test results in reports/results/")
+    commands = parser.add_subparsers(dest="command", required=True)
+    tail_parser = commands.add_parser("tail", help="Print the latest run's results")
+    tail_parser.add_argument("-f", "--follow", action="store_true", help="Keep printing new results")
+    aggregate_parser = commands.add_parser("aggregate", help="Per-test stats across runs and workers")
+    aggregate_parser.add_argument("--runs", type=int, help="Only the last N runs")
+    html_parser = commands.add_parser("html", help="Rebuild an HTML report from a run's results")
+    html_parser.add_argument("run", nargs="?", help="Run name (default: latest)")
+    html_parser.add_argument("-o", "--output")
+    args = parser.parse_args()
+
+    if args.command == "tail":
+        try:
+            tail(args.follow)
+        except KeyboardInterrupt:
+            pass
+    elif args.command == "aggregate":
+        aggregate(args.runs)
+    else:
+        write_html(args.run, args.output)
+
+
+if __name__ == "__main__":
+    main()